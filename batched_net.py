@@ -0,0 +1,285 @@
+"""Population-wide feed-forward network inference.
+
+Compiles the genomes of a generation into padded link, bias and response
+tables grouped by topological layer, so every live bird's network is
+evaluated with a few batched NumPy operations per frame instead of one
+``neat.nn.FeedForwardNetwork.activate`` call per bird.  Each node adds up
+its weighted inputs one link at a time in the genome's connection order,
+exactly as FeedForwardNetwork does, so the sums round the same way.
+"""
+import copy
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(5.0 * z, -60.0, 60.0)))
+
+
+def _tanh(z):
+    # Clipping at +-60 like neat does would not change tanh's value
+    return np.tanh(2.5 * z)
+
+
+def _relu(z):
+    return np.maximum(z, 0.0)
+
+
+def _identity(z):
+    return z
+
+
+def _clamped(z):
+    return np.clip(z, -1.0, 1.0)
+
+
+# Vectorized versions of the neat.activations functions
+ACTIVATIONS = {
+    'sigmoid': _sigmoid,
+    'tanh': _tanh,
+    'relu': _relu,
+    'identity': _identity,
+    'clamped': _clamped,
+}
+
+
+def genome_layers(genome, config):
+    """Return the genome's evaluation plan, layer by layer.
+
+    Each layer is a list of ``(node, bias, response, activation, links)``
+    tuples where ``links`` holds the ``(input_node, weight)`` pairs feeding
+    the node, as FeedForwardNetwork.create would build them.
+    """
+    connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+    return fill_plan(genome, topology_plan(connections, config))
+
+
+def topology_plan(connections, config):
+    """Layer-sorted nodes of a topology with the connection keys feeding each.
+
+    Only depends on the enabled connection keys, so every genome with the
+    same structure shares the plan whatever its weights and biases.
+    """
+    from neat.graphs import feed_forward_layers
+
+    genome_config = config.genome_config
+    incoming = {}
+    for key in connections:
+        incoming.setdefault(key[1], []).append(key)
+    return [[(node, incoming.get(node, [])) for node in sorted(layer)]
+            for layer in feed_forward_layers(genome_config.input_keys, genome_config.output_keys,
+                                             connections)]
+
+
+def fill_plan(genome, plan):
+    """Put the genome's biases, responses, activations and weights into ``plan``.
+
+    Links are listed in the genome's connection order, whatever order the
+    plan has them in, since that is the order FeedForwardNetwork sums them.
+    """
+    order = {key: i for i, key in enumerate(genome.connections)}
+    layers = []
+    for layer in plan:
+        nodes = []
+        for node, keys in layer:
+            ng = genome.nodes[node]
+            if ng.aggregation != 'sum':
+                raise ValueError("Batched networks only support sum aggregation, "
+                                 "node {0} uses {1!r}".format(node, ng.aggregation))
+            if ng.activation not in ACTIVATIONS:
+                raise ValueError("No batched version of activation {0!r}".format(ng.activation))
+            links = [(key[0], genome.connections[key].weight) for key in sorted(keys, key=order.__getitem__)]
+            nodes.append((node, ng.bias, ng.response, ng.activation, links))
+        layers.append(nodes)
+    return layers
+
+
+class PlanCache:
+    """Evaluation plans of recently seen topologies.
+
+    Most genomes of a generation only had their weights and biases mutated,
+    so the layer sorting is looked up by structure and only the values are
+    read from the genome.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.plans = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def layers(self, genome, config):
+        """``genome_layers(genome, config)``, sorting only topologies not seen before."""
+        genome_config = config.genome_config
+        connections = tuple(sorted(cg.key for cg in genome.connections.values() if cg.enabled))
+        key = (tuple(genome_config.input_keys), tuple(genome_config.output_keys), connections)
+        plan = self.plans.get(key)
+        if plan is None:
+            self.misses += 1
+            plan = topology_plan(connections, config)
+            self.plans[key] = plan
+            if len(self.plans) > self.max_entries:
+                self.plans.popitem(last=False)
+        else:
+            self.hits += 1
+            self.plans.move_to_end(key)
+        return fill_plan(genome, plan)
+
+
+# Shared by every BatchedNetwork of a process, so plans carry over between generations
+plan_cache = PlanCache()
+
+
+class BatchedNetwork:
+    def __init__(self, genomes, config, cache=None):
+        """Compile a list of genomes into one batched network.
+
+        Plans of known topologies come from ``cache`` (the shared
+        ``plan_cache`` by default).
+        """
+        if cache is None:
+            cache = plan_cache
+        genome_config = config.genome_config
+        self.input_keys = list(genome_config.input_keys)
+        self.output_keys = list(genome_config.output_keys)
+        self.activation_names = sorted(ACTIVATIONS)
+        plans = [cache.layers(genome, config) for genome in genomes]
+        self.size = len(plans)
+
+        # Layer l of every genome is padded to the widest layer l in the
+        # population and to the most links any of its nodes has
+        num_layers = max((len(plan) for plan in plans), default=0)
+        self.widths = [max(len(plan[l]) for plan in plans if l < len(plan)) for l in range(num_layers)]
+        self.fan_ins = [max((len(node[4]) for plan in plans if l < len(plan) for node in plan[l]), default=0)
+                        for l in range(num_layers)]
+        self.offsets = []
+        offset = len(self.input_keys)
+        for width in self.widths:
+            self.offsets.append(offset)
+            offset += width
+        # One extra always-zero column for padding links and outputs that are never computed
+        self.num_slots = offset + 1
+        self.zero_slot = offset
+
+        # Link k of node j reads slot sources[l][p, k, j]; padding links add 0.0 * 0.0
+        self.sources = [np.full((self.size, f, w), self.zero_slot, dtype=np.intp)
+                        for f, w in zip(self.fan_ins, self.widths)]
+        self.weights = [np.zeros((self.size, f, w)) for f, w in zip(self.fan_ins, self.widths)]
+        self.biases = [np.zeros((self.size, w)) for w in self.widths]
+        self.responses = [np.zeros((self.size, w)) for w in self.widths]
+        # Padding slots use the default activation so layers stay single-function
+        default = self.activation_names.index(genome_config.activation_default)
+        self.activations = [np.full((self.size, w), default, dtype=np.int8) for w in self.widths]
+        self.output_slots = np.full((self.size, len(self.output_keys)), self.zero_slot, dtype=np.intp)
+
+        for p, plan in enumerate(plans):
+            slots = {key: i for i, key in enumerate(self.input_keys)}
+            for l, layer in enumerate(plan):
+                for j, (node, bias, response, activation, links) in enumerate(layer):
+                    for k, (inode, weight) in enumerate(links):
+                        self.sources[l][p, k, j] = slots[inode]
+                        self.weights[l][p, k, j] = weight
+                    self.biases[l][p, j] = bias
+                    self.responses[l][p, j] = response
+                    self.activations[l][p, j] = self.activation_names.index(activation)
+                    slots[node] = self.offsets[l] + j
+            for k, key in enumerate(self.output_keys):
+                if key in slots:
+                    self.output_slots[p, k] = slots[key]
+
+        # Activation functions actually present in each layer
+        self.layer_activations = [sorted(set(np.unique(a).tolist())) for a in self.activations]
+        self._flat_sources = None
+        self._rows = None
+        self._selected = None
+
+    def repeat(self, copies):
+        """Return a network with every genome repeated ``copies`` times.
+
+        Genome i of this network becomes rows ``i * copies`` to
+        ``(i + 1) * copies - 1``, so one genome can be evaluated on several
+        games at once.  Only the compiled arrays are copied.
+        """
+        net = copy.copy(self)
+        net.size = self.size * copies
+        net.sources = [np.repeat(s, copies, axis=0) for s in self.sources]
+        net.weights = [np.repeat(w, copies, axis=0) for w in self.weights]
+        net.biases = [np.repeat(b, copies, axis=0) for b in self.biases]
+        net.responses = [np.repeat(r, copies, axis=0) for r in self.responses]
+        net.activations = [np.repeat(a, copies, axis=0) for a in self.activations]
+        net.output_slots = np.repeat(self.output_slots, copies, axis=0)
+        net._flat_sources = None
+        net._rows = None
+        net._selected = None
+        return net
+
+    def activate(self, inputs, rows=None):
+        """Evaluate many networks at once.
+
+        ``inputs`` is an (n, num_inputs) array; row i is fed to genome
+        ``rows[i]`` (or genome i when ``rows`` is None), whatever order the
+        rows come in.  Returns an (n, num_outputs) array of output values
+        in the same order.
+        """
+        inputs = np.asarray(inputs, dtype=np.float64)
+        sources, weights, biases, responses, activations, output_slots, positions = self._select(rows)
+
+        values = np.zeros((len(output_slots), self.num_slots))
+        values[positions, :len(self.input_keys)] = inputs
+        flat = values.reshape(-1)
+        for l, offset in enumerate(self.offsets):
+            width = self.widths[l]
+            terms = np.take(flat, sources[l]) * weights[l]
+            # Same additions in the same order as sum() over the node's links
+            s = np.zeros((len(values), width))
+            for k in range(self.fan_ins[l]):
+                s += terms[:, k]
+            z = biases[l] + responses[l] * s
+            codes = self.layer_activations[l]
+            if len(codes) == 1:
+                out = ACTIVATIONS[self.activation_names[codes[0]]](z)
+            else:
+                out = np.empty_like(z)
+                for code in codes:
+                    mask = activations[l] == code
+                    out[mask] = ACTIVATIONS[self.activation_names[code]](z[mask])
+            values[:, offset:offset + width] = out
+
+        outputs = np.take_along_axis(values, output_slots, axis=1)
+        return outputs[positions]
+
+    def _select(self, rows):
+        """Return the link tables for ``rows``, re-slicing them only occasionally.
+
+        Rows are usually the live birds, which only ever shrink.  The sliced
+        tables are kept for a superset of the requested rows and rebuilt
+        once that superset is more than twice the size of the live set.
+        Sources come as indices into the flattened (rows, slots) value array;
+        ``positions`` locates each requested row in the sliced tables.
+        """
+        if rows is not None:
+            rows = np.asarray(rows, dtype=np.intp)
+        if rows is None or len(rows) == self.size:
+            if self._flat_sources is None:
+                self._flat_sources = self._flatten(self.sources, self.size)
+            return (self._flat_sources, self.weights, self.biases, self.responses, self.activations,
+                    self.output_slots, slice(None) if rows is None else rows)
+
+        if self._rows is None or len(self._rows) > 2 * len(rows) or not np.isin(rows, self._rows).all():
+            # Kept sorted, so requested rows are found by binary search
+            self._rows = selected = np.unique(rows)
+            self._selected = (
+                self._flatten([s[selected] for s in self.sources], len(selected)),
+                [w[selected] for w in self.weights],
+                [b[selected] for b in self.biases],
+                [r[selected] for r in self.responses],
+                [a[selected] for a in self.activations],
+                self.output_slots[selected],
+            )
+        positions = np.searchsorted(self._rows, rows)
+        return self._selected + (positions,)
+
+    def _flatten(self, sources, n):
+        row_start = (np.arange(n) * self.num_slots)[:, None, None]
+        return [row_start + s for s in sources]
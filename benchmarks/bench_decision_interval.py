@@ -0,0 +1,124 @@
+"""Inference saved vs fitness lost for each network decision interval.
+
+A population is first evolved for a few generations (decisions every
+frame) so most birds can fly.  It is then played on held-out courses with
+decision intervals k = 1, 2, 3, ...: the networks are only queried every
+k-th frame and the birds repeat their last decision in between.  The first
+table compares the activations and inference time with the fitness and
+survival of the same genomes; inference saved is counted per simulated
+bird frame, since birds that live longer need more decisions.  With
+``--train`` a second table evolves a fresh population at every k, showing
+whether evolution adapts to it.
+
+Usage: python benchmarks/bench_decision_interval.py [--intervals 1 2 3 4 6]
+                                                    [--generations 30] [--train]
+"""
+import argparse
+import functools
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import neat  # noqa: E402
+
+import flappy_bird_ai  # noqa: E402
+from batched_net import BatchedNetwork  # noqa: E402
+from common import load_config  # noqa: E402
+from course import Course  # noqa: E402
+from instrumentation import Probe  # noqa: E402
+from vector_sim import PopulationSim, GenerationBudget  # noqa: E402
+
+
+def evolve(config, generations, seed, max_frames, decision_interval=1):
+    """Genomes of the last generation of a headless run on course ``seed``."""
+    pop = neat.Population(config)
+    evaluate = functools.partial(flappy_bird_ai.evaluate_course, course=Course(seed),
+                                 budget=GenerationBudget(max_frames), decision_interval=decision_interval)
+    pop.run(functools.partial(flappy_bird_ai.assign_fitness, evaluate=evaluate), generations)
+    return list(pop.population.values())
+
+
+def play(genomes, config, seeds, max_frames, decision_interval):
+    """Play every genome on every course; returns fitness, frames survived and counters."""
+    probe = Probe()
+    fitness = []
+    start = time.perf_counter()
+    for seed in seeds:
+        game = flappy_bird_ai.Game(headless=True, seed=seed, verbose=False)
+        sim = PopulationSim(len(genomes), game, shared_pipe_reward=False, probe=probe,
+                            decision_interval=decision_interval)
+        nets = BatchedNetwork(genomes, config)
+
+        def activate(inputs, rows):
+            return nets.activate(inputs, rows)[:, 0]
+
+        while sim.any_alive() and game.frame_iteration < max_frames:
+            sim.step(activate)
+        fitness.extend(sim.fitness.tolist())
+    elapsed = time.perf_counter() - start
+    games = len(genomes) * len(seeds)
+    return {
+        "activations": probe.counters["activations"],
+        "inference": probe.timings["inference"],
+        "seconds": elapsed,
+        "mean_fitness": float(np.mean(fitness)),
+        "best_fitness": float(np.max(fitness)),
+        "mean_frames": probe.counters["alive_bird_frames"] / games,
+        "bird_frames": probe.counters["alive_bird_frames"],
+    }
+
+
+def print_table(rows, reference):
+    print(f"{'k':>3} {'activations':>12} {'act/frame':>10} {'saved':>7} {'inference s':>12} {'total s':>8} "
+          f"{'mean fit':>9} {'change':>8} {'best fit':>9} {'frames':>8} {'change':>8}")
+    reference_rate = reference["activations"] / reference["bird_frames"]
+    for k, row in rows:
+        rate = row["activations"] / row["bird_frames"]
+        saved = 1 - rate / reference_rate
+        fitness_change = row["mean_fitness"] / reference["mean_fitness"] - 1
+        frames_change = row["mean_frames"] / reference["mean_frames"] - 1
+        print(f"{k:>3} {row['activations']:>12,} {rate:>10.2f} {saved:>7.0%} {row['inference']:>12.3f} "
+              f"{row['seconds']:>8.3f} {row['mean_fitness']:>9.1f} {fitness_change:>+8.1%} "
+              f"{row['best_fitness']:>9.1f} {row['mean_frames']:>8.0f} {frames_change:>+8.1%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--intervals", type=int, nargs="+", default=[1, 2, 3, 4, 6])
+    parser.add_argument("--generations", type=int, default=30,
+                        help="generations evolved before measuring (and per k with --train)")
+    parser.add_argument("--courses", type=int, default=4, help="held-out courses to play")
+    parser.add_argument("--max-frames", type=int, default=3000)
+    parser.add_argument("--train", action="store_true",
+                        help="also evolve a population at every decision interval")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = load_config()
+    seeds = [args.seed + 1000 + k for k in range(args.courses)]
+
+    random.seed(args.seed)
+    genomes = evolve(config, args.generations, args.seed, args.max_frames)
+    print(f"Population evolved for {args.generations} generations with decisions every frame, "
+          f"played on {args.courses} held-out courses:")
+    rows = [(k, play(genomes, config, seeds, args.max_frames, k)) for k in args.intervals]
+    print_table(rows, rows[0][1])
+
+    if args.train:
+        print(f"\nPopulations evolved for {args.generations} generations at each interval:")
+        rows = []
+        for k in args.intervals:
+            random.seed(args.seed)
+            genomes = evolve(config, args.generations, args.seed, args.max_frames, k)
+            rows.append((k, play(genomes, config, seeds, args.max_frames, k)))
+        print_table(rows, rows[0][1])
+
+
+if __name__ == "__main__":
+    main()
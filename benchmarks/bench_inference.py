@@ -0,0 +1,69 @@
+"""Compare per-bird FeedForwardNetwork.activate with BatchedNetwork.activate.
+
+Usage: python benchmarks/bench_inference.py [--sizes 50 500 5000] [--mutations 20]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import neat  # noqa: E402
+
+from batched_net import BatchedNetwork  # noqa: E402
+from common import load_config, make_genomes  # noqa: E402
+
+
+def make_inputs(size):
+    y = np.random.uniform(0, 575, size)
+    gap_y = np.random.uniform(200, 400, size)
+    return np.column_stack([y, np.abs(y - gap_y), np.random.uniform(0, 300, size)])
+
+
+def bench(config, size, mutations, frames):
+    genomes = make_genomes(config, size, mutations)
+    inputs = make_inputs(size)
+
+    nets = [neat.nn.FeedForwardNetwork.create(g, config) for g in genomes]
+    rows = inputs.tolist()
+    start = time.perf_counter()
+    for _ in range(frames):
+        reference = [net.activate(row)[0] for net, row in zip(nets, rows)]
+    loop_time = time.perf_counter() - start
+
+    batched = BatchedNetwork(genomes, config)
+    start = time.perf_counter()
+    for _ in range(frames):
+        outputs = batched.activate(inputs)[:, 0]
+    batch_time = time.perf_counter() - start
+
+    error = float(np.max(np.abs(outputs - np.array(reference))))
+    activations = size * frames
+    return activations / loop_time, activations / batch_time, error
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--mutations", type=int, default=20,
+                        help="maximum number of mutations applied to each genome")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+    config = load_config()
+    print(f"{'birds':>8} {'loop act/s':>14} {'batched act/s':>14} {'speedup':>8} {'max error':>10}")
+    for size in args.sizes:
+        loop_rate, batch_rate, error = bench(config, size, args.mutations, args.frames)
+        print(f"{size:>8} {loop_rate:>14,.0f} {batch_rate:>14,.0f} {batch_rate / loop_rate:>7.1f}x {error:>10.1e}")
+
+
+if __name__ == "__main__":
+    main()
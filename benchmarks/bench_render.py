@@ -0,0 +1,77 @@
+"""Frame time of drawing a population of birds: pygame.draw vs the sprite cache.
+
+Usage: python benchmarks/bench_render.py [--sizes 50 500 5000] [--frames 20]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from physics import SCREEN_WIDTH, SCREEN_HEIGHT, BIRD_SIZE, BIRD_X, WING_SPEED  # noqa: E402
+from render_cache import BirdSpriteCache, draw_bird  # noqa: E402
+
+
+def frame_time(screen, draw, ys, frames):
+    wing_angle = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.fill((135, 206, 235))
+        for y in ys:
+            draw(screen, y, wing_angle)
+        wing_angle += WING_SPEED
+        if wing_angle > 2 * math.pi:
+            wing_angle = 0
+    return (time.perf_counter() - start) / frames
+
+
+def check_identical(cache, samples=500):
+    """Compare cached and direct drawing pixel by pixel."""
+    wing_angle = 0
+    for _ in range(samples):
+        y = random.uniform(-5, SCREEN_HEIGHT - BIRD_SIZE)
+        surfaces = []
+        for draw in (lambda s: draw_bird(s, BIRD_X, y, BIRD_SIZE, wing_angle),
+                     lambda s: cache.draw(s, BIRD_X, y, wing_angle)):
+            surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            surface.fill((135, 206, 235))
+            draw(surface)
+            surfaces.append(pygame.image.tobytes(surface, "RGB"))
+        if surfaces[0] != surfaces[1]:
+            return False
+        wing_angle += WING_SPEED
+        if wing_angle > 2 * math.pi:
+            wing_angle = 0
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    cache = BirdSpriteCache()
+
+    print(f"pixel-identical: {check_identical(cache)}")
+    print(f"{'birds':>8} {'draw ms/frame':>14} {'cached ms/frame':>16} {'speedup':>8}")
+    for size in args.sizes:
+        ys = [random.uniform(0, SCREEN_HEIGHT - BIRD_SIZE) for _ in range(size)]
+        direct = frame_time(screen, lambda s, y, w: draw_bird(s, BIRD_X, y, BIRD_SIZE, w), ys, args.frames)
+        cached = frame_time(screen, lambda s, y, w: cache.draw(s, BIRD_X, y, w), ys, args.frames)
+        print(f"{size:>8} {direct * 1000:>14.2f} {cached * 1000:>16.2f} {direct / cached:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
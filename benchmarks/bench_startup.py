@@ -0,0 +1,97 @@
+"""Start-up time of the train, play and worker entry points.
+
+Each entry point runs in a fresh interpreter (SDL dummy drivers) until it is
+ready to do its first frame of work; the table shows the median wall-clock
+time and whether pygame and neat were actually imported.
+
+Usage: python benchmarks/bench_startup.py [--repeats 5]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CONFIG_PATH = os.path.join(ROOT, "config-feedforward.txt")
+
+ENTRY_POINTS = {
+    "python": "pass",
+    "physics": "import physics",
+    "worker": (
+        "import flappy_bird_ai as f\n"
+        "f.Game(headless=True, seed=0, verbose=False)"
+    ),
+    "train": (
+        "import neat, flappy_bird_ai as f\n"
+        "config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,\n"
+        "                     neat.DefaultSpeciesSet, neat.DefaultStagnation, CONFIG_PATH)\n"
+        "neat.Population(config)\n"
+        "f.Game(headless=True, verbose=False)"
+    ),
+    "play": (
+        "import flappy_bird_ai as f\n"
+        "net = f.load_winner(CONFIG_PATH)\n"
+        "f.Game(verbose=False)\n"
+        "net.activate((300.0, 0.0, 267.0))"
+    ),
+}
+
+# Appended to every entry point: report which heavy modules were really loaded
+REPORT = (
+    "\nimport sys, json\n"
+    "loaded = lambda name: type(sys.modules.get(name)).__name__ == 'module'\n"
+    "print(json.dumps({'pygame': loaded('pygame'), 'neat': loaded('neat')}))\n"
+)
+
+
+def export_model(directory):
+    """Write a compiled network of a random genome for the play entry point."""
+    import neat
+    from compiled_net import export_network
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation, CONFIG_PATH)
+    genome = config.genome_type(0)
+    genome.configure_new(config.genome_config)
+    for _ in range(20):
+        genome.mutate(config.genome_config)
+    export_network(genome, config, os.path.join(directory, "best_genome.net"))
+
+
+def run_entry(code, cwd):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+               PYGAME_HIDE_SUPPORT_PROMPT="1", PYTHONPATH=ROOT)
+    script = f"CONFIG_PATH = {CONFIG_PATH!r}\n" + code + REPORT
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", script], cwd=cwd, env=env,
+                            capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    return elapsed, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as directory:
+        export_model(directory)
+        print(f"{'entry point':<12} {'median ms':>10} {'pygame':>7} {'neat':>6}")
+        for name, code in ENTRY_POINTS.items():
+            times = []
+            for _ in range(args.repeats):
+                elapsed, loaded = run_entry(code, directory)
+                times.append(elapsed)
+            print(f"{name:<12} {statistics.median(times) * 1000:>10.1f} "
+                  f"{'yes' if loaded['pygame'] else 'no':>7} {'yes' if loaded['neat'] else 'no':>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Config and genome helpers shared by the benchmark scripts."""
+import os
+import random
+
+import neat
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_PATH = os.path.join(ROOT, "config-feedforward.txt")
+
+
+def load_config():
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                       neat.DefaultSpeciesSet, neat.DefaultStagnation, CONFIG_PATH)
+
+
+def make_genomes(config, size, mutations=20):
+    """Random genomes with varied topologies from repeated mutation."""
+    genomes = []
+    for key in range(size):
+        genome = config.genome_type(key)
+        genome.configure_new(config.genome_config)
+        for _ in range(random.randint(0, mutations)):
+            genome.mutate(config.genome_config)
+        genomes.append(genome)
+    return genomes
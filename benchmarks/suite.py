@@ -0,0 +1,280 @@
+"""Benchmark suite for the simulation, inference and render paths.
+
+Runs headless (SDL dummy video driver), writes the results to a JSON file
+and, when a baseline file exists, flags every metric that got worse than
+the baseline by more than the threshold.
+
+Usage: python benchmarks/suite.py [--quick] [--output results.json]
+                                  [--baseline baseline.json] [--save-baseline]
+                                  [--threshold 0.10]
+
+Exits with status 1 if a regression was found and 2 if the baseline was
+measured with a different --quick setting.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np  # noqa: E402
+import neat  # noqa: E402
+
+import flappy_bird_ai  # noqa: E402
+from common import load_config, make_genomes  # noqa: E402
+from batched_net import BatchedNetwork, PlanCache  # noqa: E402
+from physics import SCREEN_WIDTH, SCREEN_HEIGHT  # noqa: E402
+from vector_sim import PopulationSim, GenerationBudget  # noqa: E402
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(HERE, "results.json")
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+
+
+def timed(run, min_seconds):
+    """Call ``run()`` until ``min_seconds`` have passed.
+
+    ``run`` returns how many units of work it did; returns units per second.
+    """
+    units = 0
+    start = time.perf_counter()
+    while True:
+        units += run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return units / elapsed
+
+
+def bench_sim(size, frames, min_seconds):
+    """Simulated frames/s of PopulationSim with a scripted controller.
+
+    The controller keeps the birds near the gap so the whole population
+    stays alive and every frame does the full amount of work.
+    """
+    offsets = np.random.uniform(-20, 20, size)
+
+    def run():
+        game = flappy_bird_ai.Game(headless=True, seed=0, verbose=False)
+        sim = PopulationSim(size, game)
+
+        def activate(inputs, rows):
+            pipes = game.pipes
+            pipe = pipes[1] if len(pipes) > 1 and pipes[0].x < sim.x else pipes[0]
+            return (sim.y[rows] > pipe.gap_y + offsets[rows]) & (sim.velocity[rows] > 0)
+
+        while sim.any_alive() and game.frame_iteration < frames:
+            sim.step(activate)
+        return game.frame_iteration
+
+    return timed(run, min_seconds)
+
+
+def bench_activations(config, size, min_seconds):
+    """Network activations/s: per-genome FeedForwardNetwork vs BatchedNetwork."""
+    genomes = make_genomes(config, size)
+    y = np.random.uniform(0, SCREEN_HEIGHT - 25, size)
+    inputs = np.column_stack([y, np.abs(y - 300), np.random.uniform(0, 300, size)])
+    rows = inputs.tolist()
+
+    nets = [neat.nn.FeedForwardNetwork.create(g, config) for g in genomes]
+
+    def run_loop():
+        for net, row in zip(nets, rows):
+            net.activate(row)
+        return size
+
+    batched = BatchedNetwork(genomes, config)
+
+    def run_batched():
+        batched.activate(inputs)
+        return size
+
+    return timed(run_loop, min_seconds), timed(run_batched, min_seconds)
+
+
+def bench_setup(config, size, min_seconds):
+    """Network setups/s of a generation: every topology new vs all plans cached."""
+    genomes = make_genomes(config, size)
+
+    def run_cold():
+        BatchedNetwork(genomes, config, cache=PlanCache())
+        return 1
+
+    cache = PlanCache()
+    BatchedNetwork(genomes, config, cache=cache)
+
+    def run_cached():
+        BatchedNetwork(genomes, config, cache=cache)
+        return 1
+
+    return timed(run_cold, min_seconds), timed(run_cached, min_seconds)
+
+
+def bench_collisions(size, min_seconds):
+    """Collision checks/s: Pipe.collides_with per bird vs the vectorized test."""
+    pipe = flappy_bird_ai.Pipe(0, 300)
+    pipe.x = SCREEN_WIDTH // 3 - 30  # Overlapping the birds horizontally
+    birds = [flappy_bird_ai.Bird(SCREEN_WIDTH // 3, random.uniform(0, SCREEN_HEIGHT - 25))
+             for _ in range(size)]
+
+    def run_objects():
+        for bird in birds:
+            pipe.collides_with(bird)
+        return size
+
+    game = flappy_bird_ai.Game(headless=True, seed=0, verbose=False)
+    sim = PopulationSim(size, game)
+    sim.y[:] = [bird.y for bird in birds]
+
+    def run_vectorized():
+        sim.alive[:] = True
+        sim._collide(pipe)
+        return size
+
+    return timed(run_objects, min_seconds), timed(run_vectorized, min_seconds)
+
+
+def bench_render(size, frames):
+    """Milliseconds per Game.draw of a windowed game with ``size`` birds."""
+    game = flappy_bird_ai.Game(headless=False, seed=0, verbose=False)
+    birds = [flappy_bird_ai.Bird(SCREEN_WIDTH // 3, random.uniform(0, SCREEN_HEIGHT - 25))
+             for _ in range(size)]
+    start = time.perf_counter()
+    for _ in range(frames):
+        for bird in birds:
+            bird.velocity = 0
+            bird.update()
+        for pipe in game.pipes:
+            pipe.update()
+        game.draw(birds, 1)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def bench_generation(config, size, max_frames, repeats):
+    """Wall-clock seconds of one headless eval_genomes call."""
+    times = []
+    for _ in range(repeats):
+        genomes = list(enumerate(make_genomes(config, size)))
+        start = time.perf_counter()
+        flappy_bird_ai.eval_genomes(genomes, config, headless=True,
+                                    budget=GenerationBudget(max_frames=max_frames))
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run_suite(quick=False):
+    """Run every benchmark; returns ``{name: {"value", "unit", "higher_is_better"}}``."""
+    config = load_config()
+    sizes = [50, 500] if quick else [50, 500, 5000]
+    min_seconds = 0.2 if quick else 1.0
+    results = {}
+
+    def record(name, value, unit, higher_is_better):
+        results[name] = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+        print(f"{name:<40} {value:>14,.2f} {unit}")
+
+    for size in sizes:
+        record(f"sim_frames_per_s[{size}]", bench_sim(size, 1000, min_seconds), "frames/s", True)
+    for size in sizes:
+        loop_rate, batch_rate = bench_activations(config, size, min_seconds)
+        record(f"activations_per_s.feedforward[{size}]", loop_rate, "act/s", True)
+        record(f"activations_per_s.batched[{size}]", batch_rate, "act/s", True)
+    for size in sizes:
+        cold_rate, cached_rate = bench_setup(config, size, min_seconds)
+        record(f"network_setups_per_s.cold[{size}]", cold_rate, "setups/s", True)
+        record(f"network_setups_per_s.cached[{size}]", cached_rate, "setups/s", True)
+    for size in sizes:
+        object_rate, vector_rate = bench_collisions(size, min_seconds)
+        record(f"collision_checks_per_s.objects[{size}]", object_rate, "checks/s", True)
+        record(f"collision_checks_per_s.vectorized[{size}]", vector_rate, "checks/s", True)
+    for size in sizes:
+        record(f"render_frame_ms[{size}]", bench_render(size, 20 if quick else 100), "ms", False)
+    record("generation_seconds", bench_generation(config, config.pop_size, 2000, 1 if quick else 3),
+           "s", False)
+    return results
+
+
+def compare(report, baseline, threshold):
+    """Return the metrics that are worse than the baseline by more than ``threshold``.
+
+    Quick runs use smaller sizes and shorter timings, so a quick report is
+    only compared with a quick baseline and a full one with a full one.
+    """
+    if report.get("quick") != baseline.get("quick"):
+        raise ValueError("The baseline was measured {0} --quick and these results {1} it; "
+                         "rerun with the same setting or save a new baseline".format(
+                             "with" if baseline.get("quick") else "without",
+                             "with" if report.get("quick") else "without"))
+    regressions = []
+    for name, result in report["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or not base["value"]:
+            continue
+        change = result["value"] / base["value"] - 1
+        if not result["higher_is_better"]:
+            change = -change
+        if change < -threshold:
+            regressions.append((name, base["value"], result["value"], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and shorter runs")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the results JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline results JSON")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown that counts as a regression (default 0.10)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+    results = run_suite(args.quick)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "quick": args.quick,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against (run with --save-baseline to create one)")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    try:
+        regressions = compare(report, baseline, args.threshold)
+    except ValueError as error:
+        print(error)
+        return 2
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+        return 0
+    print(f"Regressions beyond {args.threshold:.0%} against {args.baseline}:")
+    for name, base, value, change in regressions:
+        print(f"  {name:<40} {base:>14,.2f} -> {value:>14,.2f} ({change:+.1%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
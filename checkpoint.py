@@ -0,0 +1,161 @@
+"""Resumable NEAT checkpoints written by a background thread.
+
+The population is pickled to bytes on the evolution thread (a consistent
+snapshot taken between generations) and then compressed and written to
+disk on a background thread, so evaluation never waits for the disk.
+Files are written to a temporary name and renamed into place, so a crash
+never leaves a half-written checkpoint behind.
+"""
+import glob
+import gzip
+import itertools
+import os
+import pickle
+import queue
+import random
+import threading
+import time
+
+import neat
+
+CHECKPOINT_PREFIX = "neat-checkpoint-"
+
+
+def write_atomic(path, data):
+    """Write bytes to ``path`` via a temporary file and an atomic rename."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class BackgroundWriter:
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, path, data, compress=False):
+        """Queue ``data`` to be written to ``path``; returns immediately."""
+        self.queue.put((path, data, compress))
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            path, data, compress = item
+            try:
+                if compress:
+                    data = gzip.compress(data, compresslevel=5)
+                write_atomic(path, data)
+            except OSError as e:
+                print(f"\nFailed to write checkpoint {path}: {e}")
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """Block until every queued write is on disk."""
+        self.queue.join()
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+
+
+_default_writer = None
+
+
+def default_writer():
+    """Shared writer for one-off saves from the game loop."""
+    global _default_writer
+    if _default_writer is None:
+        _default_writer = BackgroundWriter()
+    return _default_writer
+
+
+class PopulationCheckpointer(neat.reporting.BaseReporter):
+    """Saves the full population state every N generations or T seconds.
+
+    A checkpoint holds the population, species, generation counter, best
+    genome so far, next genome key, Python RNG state and the
+    StatisticsReporter, which is everything ``restore_checkpoint`` needs
+    to continue the run.
+    """
+
+    def __init__(self, pop, stats, generation_interval=5, time_interval_seconds=300,
+                 filename_prefix=CHECKPOINT_PREFIX, writer=None):
+        self.pop = pop
+        self.stats = stats
+        self.generation_interval = generation_interval
+        self.time_interval_seconds = time_interval_seconds
+        self.filename_prefix = filename_prefix
+        self.writer = writer or BackgroundWriter()
+
+        self.current_generation = None
+        self.last_generation_checkpoint = pop.generation - 1
+        self.last_time_checkpoint = time.time()
+        # Wall-clock time of the last checkpoint saved by this run, if any
+        self.last_saved = None
+
+    def start_generation(self, generation):
+        self.current_generation = generation
+
+    def end_generation(self, config, population, species_set):
+        checkpoint_due = False
+        if self.time_interval_seconds:
+            if time.time() - self.last_time_checkpoint >= self.time_interval_seconds:
+                checkpoint_due = True
+        if not checkpoint_due and self.generation_interval:
+            if self.current_generation - self.last_generation_checkpoint >= self.generation_interval:
+                checkpoint_due = True
+
+        if checkpoint_due:
+            # The population passed in is already the next generation
+            self.save_checkpoint(config, population, species_set, self.current_generation + 1)
+            self.last_generation_checkpoint = self.current_generation
+            self.last_time_checkpoint = time.time()
+
+    def save_checkpoint(self, config, population, species_set, generation):
+        filename = f"{self.filename_prefix}{generation}"
+        print(f"Saving checkpoint to {filename}")
+        # neat does not save the genome key counter; resume past the newest key
+        next_key = max(population) + 1
+        state = (generation, config, population, species_set, self.pop.best_genome,
+                 next_key, random.getstate(), self.stats)
+        # The species set refers to the live reporters (this one owns a thread)
+        reporters = species_set.reporters
+        species_set.reporters = None
+        try:
+            data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            species_set.reporters = reporters
+        self.writer.submit(filename, data, compress=True)
+        self.last_saved = time.time()
+
+    def close(self):
+        self.writer.close()
+
+
+def restore_checkpoint(filename):
+    """Return ``(population, stats)`` resumed from a checkpoint file."""
+    with gzip.open(filename) as f:
+        (generation, config, population, species_set, best_genome,
+         next_key, rndstate, stats) = pickle.load(f)
+    random.setstate(rndstate)
+    pop = neat.Population(config, (population, species_set, generation))
+    species_set.reporters = pop.reporters
+    pop.best_genome = best_genome
+    pop.reproduction.genome_indexer = itertools.count(next_key)
+    return pop, stats
+
+
+def latest_checkpoint(filename_prefix=CHECKPOINT_PREFIX):
+    """Path of the newest checkpoint, or None if there is none."""
+    paths = [p for p in glob.glob(glob.escape(filename_prefix) + "*")
+             if p[len(filename_prefix):].isdigit()]
+    if not paths:
+        return None
+    return max(paths, key=lambda p: int(p[len(filename_prefix):]))
@@ -0,0 +1,119 @@
+"""Compact, versioned export of a trained network.
+
+``export_network`` flattens a genome into its evaluation order: for every
+computed node its activation, bias, response and incoming ``(slot, weight)``
+links.  ``load_network`` reads the file back into a ``CompiledNetwork``
+that evaluates it in pure Python, without neat, the config file or pickle,
+and gives exactly the outputs of ``neat.nn.FeedForwardNetwork``.
+
+File layout (little-endian):
+
+    header   4s magic b"FBNN", H version, H inputs, H outputs, I nodes
+    outputs  one i slot per output (-1: never computed, always 0.0)
+    nodes    B activation, d bias, d response, I links,
+             then per link I slot, d weight
+
+Slots 0 .. inputs-1 hold the inputs and node k of the file writes slot
+``inputs + k``.
+"""
+import math
+import struct
+
+MAGIC = b"FBNN"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHHI")
+_NODE = struct.Struct("<BddI")
+_LINK = struct.Struct("<Id")
+
+
+def _sigmoid(z):
+    z = max(-60.0, min(60.0, 5.0 * z))
+    return 1.0 / (1.0 + math.exp(-z))
+
+
+def _tanh(z):
+    z = max(-60.0, min(60.0, 2.5 * z))
+    return math.tanh(z)
+
+
+def _relu(z):
+    return z if z > 0.0 else 0.0
+
+
+def _identity(z):
+    return z
+
+
+def _clamped(z):
+    return max(-1.0, min(1.0, z))
+
+
+# Codes are part of the file format: only ever append
+ACTIVATION_CODES = ['sigmoid', 'tanh', 'relu', 'identity', 'clamped']
+_ACTIVATION_FUNCTIONS = [_sigmoid, _tanh, _relu, _identity, _clamped]
+
+
+class CompiledNetwork:
+    def __init__(self, num_inputs, output_slots, nodes):
+        """``nodes`` is a list of ``(activation, bias, response, links)`` in evaluation order."""
+        self.num_inputs = num_inputs
+        self.output_slots = output_slots
+        self.nodes = nodes
+
+    def activate(self, inputs):
+        if len(inputs) != self.num_inputs:
+            raise RuntimeError("Expected {0:n} inputs, got {1:n}".format(self.num_inputs, len(inputs)))
+        values = list(inputs)
+        for activation, bias, response, links in self.nodes:
+            s = sum([values[slot] * weight for slot, weight in links])
+            values.append(activation(bias + response * s))
+        return [values[slot] if slot >= 0 else 0.0 for slot in self.output_slots]
+
+
+def export_network(genome, config, path):
+    """Write ``genome`` as a compiled network file; needs neat."""
+    from batched_net import genome_layers
+
+    genome_config = config.genome_config
+    slots = {key: i for i, key in enumerate(genome_config.input_keys)}
+    records = []
+    for layer in genome_layers(genome, config):
+        for node, bias, response, activation, links in layer:
+            if activation not in ACTIVATION_CODES:
+                raise ValueError("Activation {0!r} can not be exported".format(activation))
+            record = [_NODE.pack(ACTIVATION_CODES.index(activation), bias, response, len(links))]
+            record += [_LINK.pack(slots[i], weight) for i, weight in links]
+            records.append(b"".join(record))
+            slots[node] = len(slots)
+
+    output_slots = [slots.get(key, -1) for key in genome_config.output_keys]
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(genome_config.input_keys),
+                             len(output_slots), len(records)))
+        f.write(struct.pack("<{0}i".format(len(output_slots)), *output_slots))
+        f.write(b"".join(records))
+
+
+def load_network(path):
+    """Read a file written by ``export_network``."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, num_inputs, num_outputs, num_nodes = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("{0} is not a compiled network file".format(path))
+    if version > VERSION:
+        raise ValueError("{0} has format version {1}, this loader reads up to {2}".format(
+            path, version, VERSION))
+
+    offset = _HEADER.size
+    output_slots = list(struct.unpack_from("<{0}i".format(num_outputs), data, offset))
+    offset += 4 * num_outputs
+    nodes = []
+    for _ in range(num_nodes):
+        code, bias, response, num_links = _NODE.unpack_from(data, offset)
+        offset += _NODE.size
+        links = [_LINK.unpack_from(data, offset + k * _LINK.size) for k in range(num_links)]
+        offset += num_links * _LINK.size
+        nodes.append((_ACTIVATION_FUNCTIONS[code], bias, response, links))
+    return CompiledNetwork(num_inputs, output_slots, nodes)
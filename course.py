@@ -0,0 +1,104 @@
+"""Seeded, precomputed pipe courses.
+
+A course is a compact table with one ``(gap_y, gap_size, speed)`` record per
+pipe index, following the training difficulty schedule.  The table is
+generated in fixed-size chunks from ``(seed, chunk)`` so any process can
+extend it lazily and still get exactly the same pipes.  ``share()`` moves
+the table into a read-only memory-mapped file; pickling a shared course
+only sends its path, so pool workers map the same pages instead of
+regenerating or unpickling the table.
+"""
+import os
+import tempfile
+
+import numpy as np
+
+from physics import GAP_Y_MIN, GAP_Y_MAX, pipe_difficulty, pipe_gap_size, pipe_speed
+
+CHUNK_SIZE = 256
+COURSE_DTYPE = np.dtype([('gap_y', '<i2'), ('gap_size', '<i2'), ('speed', '<f4')])
+
+# Shared courses already mapped by this process, keyed by file path
+_mapped = {}
+
+
+def _generate(seed, first_chunk, num_chunks):
+    table = np.empty(num_chunks * CHUNK_SIZE, dtype=COURSE_DTYPE)
+    for c in range(num_chunks):
+        chunk = first_chunk + c
+        rng = np.random.default_rng([seed, chunk])
+        rows = table[c * CHUNK_SIZE:(c + 1) * CHUNK_SIZE]
+        rows['gap_y'] = rng.integers(GAP_Y_MIN, GAP_Y_MAX, size=CHUNK_SIZE, endpoint=True)
+        levels = [pipe_difficulty(i) for i in range(chunk * CHUNK_SIZE, (chunk + 1) * CHUNK_SIZE)]
+        rows['gap_size'] = [pipe_gap_size(level) for level in levels]
+        rows['speed'] = [pipe_speed(level) for level in levels]
+    return table
+
+
+class Course:
+    def __init__(self, seed, length=CHUNK_SIZE, table=None):
+        self.seed = seed
+        self.path = None
+        self._owns_file = False
+        if table is None:
+            table = _generate(seed, 0, -(-length // CHUNK_SIZE))
+        self.table = table
+
+    def __len__(self):
+        return len(self.table)
+
+    def pipe(self, index):
+        """Return ``(gap_y, gap_size, speed)`` of the index-th pipe."""
+        if index >= len(self.table):
+            self.extend(index + 1)
+        row = self.table[index]
+        return int(row['gap_y']), int(row['gap_size']), float(row['speed'])
+
+    def gap_y(self, index):
+        if index >= len(self.table):
+            self.extend(index + 1)
+        return int(self.table['gap_y'][index])
+
+    def extend(self, length):
+        """Generate pipes up to at least ``length``.
+
+        A shared (memory-mapped) table is left untouched; this process
+        continues with a private, extended copy.
+        """
+        have = len(self.table) // CHUNK_SIZE
+        need = -(-length // CHUNK_SIZE)
+        if need > have:
+            self.table = np.concatenate([self.table, _generate(self.seed, have, need - have)])
+
+    def share(self, directory=None):
+        """Move the table into a read-only memory-mapped file and return self."""
+        fd, path = tempfile.mkstemp(prefix=f"course-{self.seed}-", suffix=".npy", dir=directory)
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, self.table)
+        self.path = path
+        self._owns_file = True
+        self.table = np.load(path, mmap_mode='r')
+        return self
+
+    def close(self):
+        """Delete the shared table file created by ``share()``."""
+        if self._owns_file:
+            _mapped.pop(self.path, None)
+            os.remove(self.path)
+            self.path = None
+            self._owns_file = False
+
+    @classmethod
+    def load(cls, path, seed):
+        """Map a course table saved by ``share()`` (read-only, no copy)."""
+        course = _mapped.get(path)
+        if course is None or course.seed != seed:
+            course = cls(seed, table=np.load(path, mmap_mode='r'))
+            course.path = path
+            _mapped[path] = course
+        return course
+
+    def __reduce__(self):
+        if self.path is not None:
+            return (Course.load, (self.path, self.seed))
+        return (Course, (self.seed, len(self.table), self.table))
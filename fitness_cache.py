@@ -0,0 +1,105 @@
+"""Fitness memoization for genomes that were already evaluated.
+
+Elites, and children that came out of reproduction without a change, play
+exactly as before.  On a seeded course with individual pipe rewards
+(``evaluate_course``, ``evaluate_courses``) their fitness only depends on
+their genes, the course and the frame limit.  So ``CachedFitness`` looks
+every genome up by a content hash first and only simulates the misses.
+
+The single-process ``eval_genomes`` can not be cached: its pipe rewards
+are shared by the whole population and its clock limits are not
+reproducible.
+"""
+import hashlib
+from collections import OrderedDict
+
+import neat
+
+
+def genome_digest(genome):
+    """Hash of everything that decides how the genome plays.
+
+    Node and connection genes are hashed in key order with the exact float
+    values, so two genomes share a digest only if they build the same
+    network.  The genome key and its old fitness are not part of it.
+    """
+    nodes = sorted((key, node.bias, node.response, node.activation, node.aggregation)
+                   for key, node in genome.nodes.items())
+    connections = sorted((key, conn.weight) for key, conn in genome.connections.items() if conn.enabled)
+    return hashlib.blake2b(repr((nodes, connections)).encode(), digest_size=16).digest()
+
+
+class FitnessCache:
+    """Bounded least-recently-used map from ``(digest, course)`` to fitness."""
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.lookups = 0
+
+    def get(self, key):
+        self.lookups += 1
+        fitness = self.entries.get(key)
+        if fitness is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return fitness
+
+    def put(self, key, fitness):
+        self.entries[key] = fitness
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class CachedFitness:
+    def __init__(self, fitness_function, cache, course):
+        """
+        Wrap a NEAT fitness function; ``course`` identifies everything
+        besides the genome that decides fitness (course seeds, frame limit,
+        aggregation).
+        """
+        self.fitness_function = fitness_function
+        self.cache = cache
+        self.course = course
+
+    def __call__(self, genomes, config):
+        misses = []
+        for genome_id, genome in genomes:
+            key = (genome_digest(genome), self.course)
+            fitness = self.cache.get(key)
+            if fitness is None:
+                misses.append((genome_id, genome, key))
+            else:
+                genome.fitness = fitness
+        if misses:
+            self.fitness_function([(genome_id, genome) for genome_id, genome, _ in misses], config)
+            for _, genome, key in misses:
+                self.cache.put(key, genome.fitness)
+
+
+class FitnessCacheReporter(neat.reporting.BaseReporter):
+    """Prints the cache hit rate after each generation's evaluation."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.hits = 0
+        self.lookups = 0
+
+    def start_generation(self, generation):
+        self.hits = self.cache.hits
+        self.lookups = self.cache.lookups
+
+    def post_evaluate(self, config, population, species, best_genome):
+        cache = self.cache
+        hits = cache.hits - self.hits
+        lookups = cache.lookups - self.lookups
+        if not lookups:
+            return
+        print(f"Fitness cache: {hits}/{lookups} hits ({100.0 * hits / lookups:.1f}%), "
+              f"{100.0 * cache.hits / cache.lookups:.1f}% overall, "
+              f"{len(cache)}/{cache.max_entries} entries")
@@ -1,10 +1,15 @@
-import pygame
 import random
 import sys
 import math
+import time
+import argparse
 
-# Initialize Pygame
-pygame.init()
+from course import Course
+from lazy_import import lazy_import
+from render_cache import bird_sprites, DirtyRectRenderer, PipeSurfaceCache, text_cache
+
+# Imported on first use; Game initializes only the display
+pygame = lazy_import("pygame")
 
 # Constants
 SCREEN_WIDTH = 400
@@ -19,6 +24,9 @@ MIN_PIPE_SPAWN_TIME = 800  # milliseconds
 INITIAL_PIPE_GAP = 200
 MIN_PIPE_GAP = 120
 DIFFICULTY_INCREASE_SCORE = 10  # Increase difficulty every 10 points
+TICK_RATE = 60  # Simulation ticks per second, independent of the render rate
+TICK_SECONDS = 1 / TICK_RATE
+MAX_TICKS_PER_FRAME = 5  # Past this the game slows down instead of skipping ahead
 
 # Colors
 WHITE = (255, 255, 255)
@@ -26,9 +34,6 @@ BLACK = (0, 0, 0)
 SKY_BLUE = (135, 206, 235)
 GRASS_GREEN = (34, 139, 34)
 GRASS_DARK = (28, 120, 28)
-BIRD_YELLOW = (255, 215, 0)
-BIRD_ORANGE = (255, 140, 0)  # For beak
-BIRD_WHITE = (255, 255, 240)  # For wing
 PIPE_GREEN = (40, 180, 99)
 PIPE_DARK = (35, 150, 80)
 CLOUD_WHITE = (240, 240, 240)
@@ -37,10 +42,15 @@ SUN_YELLOW = (255, 255, 0)
 # Game elements
 CLOUD_POSITIONS = [(50, 100), (200, 150), (350, 80)]  # x, y positions for clouds
 
+def interpolate(previous, current, alpha):
+    # Exactly ``current`` at alpha 1
+    return current - (current - previous) * (1 - alpha)
+
 class Bird:
     def __init__(self):
         self.x = SCREEN_WIDTH // 3
         self.y = SCREEN_HEIGHT // 2
+        self.prev_y = self.y  # Position at the previous tick, for interpolation
         self.velocity = 0
         self.size = 25  # Increased size
         self.wing_angle = 0  # For smooth wing animation
@@ -49,6 +59,7 @@ class Bird:
         self.velocity = FLAP_STRENGTH
 
     def update(self):
+        self.prev_y = self.y
         self.velocity += GRAVITY
         self.y += self.velocity
         # Keep bird within screen bounds
@@ -64,84 +75,49 @@ class Bird:
         if self.wing_angle > 2 * math.pi:
             self.wing_angle = 0
 
-    def draw(self, screen):
-        # Draw main body (gradient from yellow to lighter yellow)
-        for i in range(self.size//2):
-            color = (255, 215 + i, i)  # Gradient from BIRD_YELLOW to lighter
-            pygame.draw.circle(screen, color, 
-                             (self.x - self.size//2, self.y + self.size//2), 
-                             self.size//2 - i)
-
-        # Draw detailed tail feathers
-        tail_points = [
-            (self.x - self.size, self.y + self.size//2),  # Center
-            (self.x - self.size - 12, self.y + self.size//4),  # Top
-            (self.x - self.size - 15, self.y + self.size//2),  # Middle
-            (self.x - self.size - 12, self.y + 3*self.size//4)  # Bottom
-        ]
-        pygame.draw.polygon(screen, BIRD_YELLOW, tail_points)
-        # Add tail detail lines
-        for i in range(3):
-            start = (self.x - self.size, self.y + self.size//2)
-            end = (self.x - self.size - 12, self.y + self.size//3 + i*self.size//3)
-            pygame.draw.line(screen, (200, 160, 0), start, end, 2)
-
-        # Draw wings with smooth animation
-        wing_offset = math.sin(self.wing_angle) * 5
-        # Back wing (slightly darker)
-        back_wing_points = [
-            (self.x - self.size//2 - 5, self.y + self.size//2),  # Center
-            (self.x - self.size//4 - 5, self.y + wing_offset + 5),  # Top
-            (self.x - 3*self.size//4 - 5, self.y + self.size//4 + wing_offset + 5)  # Back
-        ]
-        pygame.draw.polygon(screen, (220, 220, 205), back_wing_points)
-        # Front wing
-        front_wing_points = [
-            (self.x - self.size//2, self.y + self.size//2),  # Center
-            (self.x - self.size//4, self.y + wing_offset),  # Top
-            (self.x - 3*self.size//4, self.y + self.size//4 + wing_offset)  # Back
-        ]
-        pygame.draw.polygon(screen, BIRD_WHITE, front_wing_points)
-        
-        # Draw beak with gradient
-        beak_points = [
-            (self.x + 2, self.y + self.size//2),  # Tip
-            (self.x - self.size//4, self.y + self.size//3),  # Top
-            (self.x - self.size//4, self.y + 2*self.size//3)  # Bottom
-        ]
-        pygame.draw.polygon(screen, BIRD_ORANGE, beak_points)
-        # Add beak detail
-        pygame.draw.line(screen, (200, 100, 0), 
-                        (self.x - self.size//4, self.y + self.size//2),
-                        (self.x + 2, self.y + self.size//2), 2)
-        
-        # Add eye with detail
-        pygame.draw.circle(screen, WHITE, (self.x - self.size//3, self.y + self.size//2), 4)
-        pygame.draw.circle(screen, BLACK, (self.x - self.size//3, self.y + self.size//2), 2)
+    def draw(self, screen, alpha=1.0):
+        # One blit from the shared sprite atlas, pixel-identical to draw_bird()
+        y = interpolate(self.prev_y, self.y, alpha)
+        return bird_sprites.draw(screen, self.x, y, self.wing_angle)
 
 class Pipe:
-    def __init__(self, speed, gap_size):
-        self.gap_y = random.randint(200, SCREEN_HEIGHT - 200)
+    def __init__(self, speed, gap_size, gap_y=None):
+        if gap_y is None:
+            gap_y = random.randint(200, SCREEN_HEIGHT - 200)
+        self.gap_y = gap_y
         self.x = SCREEN_WIDTH
+        self.prev_x = self.x
         self.width = 50
         self.scored = False
         self.speed = speed
         self.gap_size = gap_size
 
     def update(self):
+        self.prev_x = self.x
         self.x -= self.speed
 
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
+        # Blit the pipe body rendered once for this gap geometry
+        x = interpolate(self.prev_x, self.x, alpha)
+        return pipe_surfaces.draw(screen, x, self.gap_y, self.gap_size)
+
+    @staticmethod
+    def render(screen, x, gap_y, gap_size, width=50):
         # Draw top pipe with rounded corners at bottom
-        top_height = self.gap_y - self.gap_size // 2
-        pygame.draw.rect(screen, PIPE_GREEN, (self.x, 0, self.width, top_height))
-        pygame.draw.rect(screen, PIPE_GREEN, (self.x - 5, top_height - 20, self.width + 10, 20))
+        top_height = gap_y - gap_size // 2
+        pygame.draw.rect(screen, PIPE_GREEN, (x, 0, width, top_height))
+        pygame.draw.rect(screen, PIPE_GREEN, (x - 5, top_height - 20, width + 10, 20))
         
         # Draw bottom pipe with rounded corners at top
-        bottom_start = self.gap_y + self.gap_size // 2
+        bottom_start = gap_y + gap_size // 2
         bottom_height = SCREEN_HEIGHT - bottom_start
-        pygame.draw.rect(screen, PIPE_GREEN, (self.x, bottom_start, self.width, bottom_height))
-        pygame.draw.rect(screen, PIPE_GREEN, (self.x - 5, bottom_start, self.width + 10, 20))
+        pygame.draw.rect(screen, PIPE_GREEN, (x, bottom_start, width, bottom_height))
+        pygame.draw.rect(screen, PIPE_GREEN, (x - 5, bottom_start, width + 10, 20))
+        
+        # Add pipe texture (vertical stripes)
+        for stripe_x in range(x, x + width, 10):
+            pygame.draw.line(screen, PIPE_DARK, (stripe_x, 0), (stripe_x, top_height), 2)
+            pygame.draw.line(screen, PIPE_DARK, (stripe_x, bottom_start), (stripe_x, SCREEN_HEIGHT), 2)
 
     def collides_with(self, bird):
         bird_rect = pygame.Rect(bird.x - bird.size, bird.y, bird.size, bird.size)
@@ -150,64 +126,79 @@ class Pipe:
                                 self.width, SCREEN_HEIGHT - (self.gap_y + self.gap_size // 2))
         return bird_rect.colliderect(top_pipe) or bird_rect.colliderect(bottom_pipe)
 
+# Pipe bodies are rendered once per (gap_y, gap_size) and reused
+pipe_surfaces = PipeSurfaceCache(Pipe.render, 50)
+
 class Cloud:
     def __init__(self, x, y):
         self.x = x
+        self.prev_x = x
         self.y = y
         self.speed = 0.5
 
     def update(self):
+        self.prev_x = self.x
         self.x -= self.speed
         if self.x < -50:
             self.x = SCREEN_WIDTH + 50
+            self.prev_x = self.x  # Don't interpolate across the wrap
 
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
         # Draw multiple circles for fluffy cloud appearance
-        pygame.draw.circle(screen, CLOUD_WHITE, (int(self.x), self.y), 20)
-        pygame.draw.circle(screen, CLOUD_WHITE, (int(self.x - 15), self.y + 10), 15)
-        pygame.draw.circle(screen, CLOUD_WHITE, (int(self.x + 15), self.y + 10), 15)
+        x = interpolate(self.prev_x, self.x, alpha)
+        rect = pygame.draw.circle(screen, CLOUD_WHITE, (int(x), self.y), 20)
+        rect.union_ip(pygame.draw.circle(screen, CLOUD_WHITE, (int(x - 15), self.y + 10), 15))
+        rect.union_ip(pygame.draw.circle(screen, CLOUD_WHITE, (int(x + 15), self.y + 10), 15))
+        return rect
 
 class ScorePopup:
     def __init__(self, x, y):
         self.x = x
         self.y = y
+        self.prev_y = y
         self.alpha = 255
-        self.lifetime = 30  # frames
+        self.lifetime = 30  # ticks
 
     def update(self):
+        self.prev_y = self.y
         self.y -= 2
         self.alpha -= 255 / self.lifetime
         self.lifetime -= 1
 
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
         if self.lifetime > 0:
-            font = pygame.font.Font(None, 24)
-            alpha_surface = pygame.Surface((30, 20), pygame.SRCALPHA)
-            text = font.render("+1", True, BLACK)
-            alpha_surface.fill((255, 255, 255, 0))
-            alpha_surface.blit(text, (0, 0))
+            # Every popup shares one pre-rendered "+1", faded per instance
+            alpha_surface = text_cache.render("+1", BLACK, 24, box=(30, 20))
             alpha_surface.set_alpha(int(self.alpha))
-            screen.blit(alpha_surface, (self.x, self.y))
+            return screen.blit(alpha_surface, (self.x, interpolate(self.prev_y, self.y, alpha)))
 
 class Game:
-    def __init__(self):
+    def __init__(self, seed=None):
+        pygame.display.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Flapping Bird")
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
         self.pipe_speed = INITIAL_PIPE_SPEED
         self.pipe_spawn_time = INITIAL_PIPE_SPAWN_TIME
         self.pipe_gap = INITIAL_PIPE_GAP
         self.clouds = [Cloud(x, y) for x, y in CLOUD_POSITIONS]
+        self.renderer = DirtyRectRenderer(self.screen, self.make_background())
         self.score_popups = []
+        # Pipe gap positions come from a seeded course; a new course per game unless seeded
+        self.seed = seed
         self.reset_game()
 
     def reset_game(self):
         self.bird = Bird()
         self.pipes = []
+        seed = self.seed if self.seed is not None else random.randrange(2**32)
+        self.course = Course(seed)
+        self.pipes_spawned = 0
         self.score = 0
         self.game_over = False
-        self.last_pipe = pygame.time.get_ticks()
+        # Time is counted in simulation ticks, so pipe spacing never depends on the frame rate
+        self.tick = 0
+        self.last_pipe = 0
 
     def handle_events(self):
         for event in pygame.event.get():
@@ -227,7 +218,9 @@ class Game:
         return True
 
     def update(self):
+        """Advance the simulation by one fixed tick."""
         if not self.game_over:
+            self.tick += 1
             self.bird.update()
 
             # Update clouds
@@ -247,9 +240,11 @@ class Game:
             self.pipe_gap = max(MIN_PIPE_GAP, INITIAL_PIPE_GAP - difficulty_level * 10)
 
             # Spawn new pipes
-            now = pygame.time.get_ticks()
-            if now - self.last_pipe > self.pipe_spawn_time:
-                self.pipes.append(Pipe(self.pipe_speed, self.pipe_gap))
+            now = self.tick
+            if (now - self.last_pipe) * 1000 > self.pipe_spawn_time * TICK_RATE:
+                self.pipes.append(Pipe(self.pipe_speed, self.pipe_gap,
+                                       self.course.gap_y(self.pipes_spawned)))
+                self.pipes_spawned += 1
                 self.last_pipe = now
 
             # Update pipes and check collisions
@@ -266,62 +261,93 @@ class Game:
                     # Add score popup
                     self.score_popups.append(ScorePopup(self.bird.x, self.bird.y - 20))
 
-    def draw(self):
-        # Fill background with sky color
-        self.screen.fill(SKY_BLUE)
+    def make_background(self):
+        # Bake the static scenery (sky, sun and ground) into one surface
+        background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        background.fill(SKY_BLUE)
         
         # Draw sun
-        pygame.draw.circle(self.screen, SUN_YELLOW, (50, 50), 30)
-        
-        # Draw clouds
-        for cloud in self.clouds:
-            cloud.draw(self.screen)
+        pygame.draw.circle(background, SUN_YELLOW, (50, 50), 30)
         
         # Draw ground with texture
-        pygame.draw.rect(self.screen, GRASS_GREEN, (0, SCREEN_HEIGHT - 20, SCREEN_WIDTH, 20))
+        pygame.draw.rect(background, GRASS_GREEN, (0, SCREEN_HEIGHT - 20, SCREEN_WIDTH, 20))
         # Add grass details
         for i in range(0, SCREEN_WIDTH, 30):
             points = [(i, SCREEN_HEIGHT - 20), (i + 15, SCREEN_HEIGHT - 30), (i + 30, SCREEN_HEIGHT - 20)]
-            pygame.draw.polygon(self.screen, GRASS_DARK, points)
+            pygame.draw.polygon(background, GRASS_DARK, points)
+        return background.convert()
+
+    def draw(self, alpha=1.0):
+        """Draw the game ``alpha`` of the way from the previous tick to the current one."""
+        if self.game_over:
+            alpha = 1.0  # Nothing moves any more
+        
+        # Restore the background where the last frame drew
+        renderer = self.renderer
+        renderer.begin()
+        
+        # Draw clouds (they stay clear of the ground, so drawing them over it is safe)
+        for cloud in self.clouds:
+            renderer.add(cloud.draw(self.screen, alpha))
         
         # Draw pipes with texture
         for pipe in self.pipes:
-            pipe.draw(self.screen)
-            # Add pipe texture (vertical stripes)
-            for x in range(int(pipe.x), int(pipe.x + pipe.width), 10):
-                pygame.draw.line(self.screen, PIPE_DARK, 
-                               (x, 0), 
-                               (x, pipe.gap_y - pipe.gap_size // 2), 2)
-                pygame.draw.line(self.screen, PIPE_DARK,
-                               (x, pipe.gap_y + pipe.gap_size // 2),
-                               (x, SCREEN_HEIGHT), 2)
+            renderer.add(pipe.draw(self.screen, alpha))
         
         # Draw bird
-        self.bird.draw(self.screen)
+        renderer.add(self.bird.draw(self.screen, alpha))
         
         # Draw score and score popups
-        score_text = self.font.render(f'Score: {self.score}', True, BLACK)
-        self.screen.blit(score_text, (10, 10))
+        score_text = text_cache.render(f'Score: {self.score}', BLACK)
+        renderer.add(self.screen.blit(score_text, (10, 10)))
         for popup in self.score_popups:
-            popup.draw(self.screen)
+            renderer.add(popup.draw(self.screen, alpha))
         
         if self.game_over:
-            game_over_text = self.font.render('Game Over! Click to restart', True, BLACK)
+            game_over_text = text_cache.render('Game Over! Click to restart', BLACK)
             text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
-            self.screen.blit(game_over_text, text_rect)
+            renderer.add(self.screen.blit(game_over_text, text_rect))
         
-        pygame.display.flip()
+        # Push only the changed parts of the screen
+        renderer.present()
 
-    def run(self):
+    def run(self, render_fps=60):
+        # Fixed-timestep loop: the accumulator hands elapsed wall-clock time
+        # to the simulation in whole ticks and rendering draws in between
         running = True
+        accumulator = 0.0
+        previous = time.perf_counter()
         while running:
+            now = time.perf_counter()
+            accumulator += now - previous
+            previous = now
+
             running = self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(60)
+            ticks = 0
+            while accumulator >= TICK_SECONDS and ticks < MAX_TICKS_PER_FRAME:
+                self.update()
+                accumulator -= TICK_SECONDS
+                ticks += 1
+            if ticks == MAX_TICKS_PER_FRAME:
+                # Too far behind to catch up: drop the backlog
+                accumulator = min(accumulator, TICK_SECONDS)
+
+            self.draw(accumulator / TICK_SECONDS)
+            self.clock.tick(render_fps)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Play Flapping Bird")
+    parser.add_argument("seed", nargs="?", type=int, default=None,
+                        help="pipe course seed (default: a new course every game)")
+    parser.add_argument("--fps", type=int, default=60,
+                        help="render frame rate; the simulation always runs at "
+                             f"{TICK_RATE} ticks per second")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    # Optional course seed: python flapping_bird.py 42
+    args = parse_args()
+    game = Game(args.seed)
+    game.run(args.fps)
     pygame.quit()
     sys.exit()
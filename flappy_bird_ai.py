@@ -1,22 +1,37 @@
-import pygame
 import random
 import os
-import neat
 import math
 import sys
 import pickle
+import argparse
+import functools
+import numpy as np
 
+from physics import SCREEN_WIDTH, SCREEN_HEIGHT, GRAVITY, FLAP_STRENGTH, PIPE_WIDTH
+from physics import DIFFICULTY_STEP_SCORE, MAX_DIFFICULTY, GAP_Y_MIN, GAP_Y_MAX
+from physics import pipe_gap_size, pipe_speed
+from course import Course
+from lazy_import import lazy_import
+from render_cache import bird_sprites, DirtyRectRenderer, PipeSurfaceCache, text_cache
+from vector_sim import PopulationSim, GenerationBudget
+from vector_env import VectorEnv
+from batched_net import BatchedNetwork
+from parallel_eval import ParallelEvaluator
+from instrumentation import NULL_PROBE, Probe
+from compiled_net import export_network, load_network
+from spectator import SpectatorView
+from replay import FlapRecorder, ReplayWriter
 
-# Initialize Pygame
-pygame.init()
+# Imported on first use: headless workers never load pygame, play mode
+# with a compiled model never loads neat, and windowed games only
+# initialize the display
+pygame = lazy_import("pygame")
+neat = lazy_import("neat")
 
 # Constants
-SCREEN_WIDTH = 400
-SCREEN_HEIGHT = 600
-GRAVITY = 0.25
-FLAP_STRENGTH = -7
-INITIAL_PIPE_SPEED = 3
 GENERATION = 0
+NUM_GENERATIONS = 50
+MODEL_PATH = "best_genome.net"  # Compiled winner used by play mode
 
 # Colors
 WHITE = (255, 255, 255)
@@ -24,9 +39,6 @@ BLACK = (0, 0, 0)
 SKY_BLUE = (135, 206, 235)
 GRASS_GREEN = (34, 139, 34)
 GRASS_DARK = (28, 120, 28)
-BIRD_YELLOW = (255, 215, 0)
-BIRD_ORANGE = (255, 140, 0)
-BIRD_WHITE = (255, 255, 240)
 PIPE_GREEN = (40, 180, 99)
 PIPE_DARK = (35, 150, 80)
 
@@ -63,85 +75,42 @@ class Bird:
             self.alive = False
 
     def draw(self, screen):
-        # Draw main body (gradient)
-        for i in range(self.size//2):
-            color = (255, 215 + i, i)
-            pygame.draw.circle(screen, color, 
-                             (self.x - self.size//2, self.y + self.size//2), 
-                             self.size//2 - i)
-
-        # Draw tail feathers with detail
-        tail_points = [
-            (self.x - self.size, self.y + self.size//2),
-            (self.x - self.size - 12, self.y + self.size//4),
-            (self.x - self.size - 15, self.y + self.size//2),
-            (self.x - self.size - 12, self.y + 3*self.size//4)
-        ]
-        pygame.draw.polygon(screen, BIRD_YELLOW, tail_points)
-        for i in range(3):
-            start = (self.x - self.size, self.y + self.size//2)
-            end = (self.x - self.size - 12, self.y + self.size//3 + i*self.size//3)
-            pygame.draw.line(screen, (200, 160, 0), start, end, 2)
-
-        # Draw wings with animation
-        wing_offset = math.sin(self.wing_angle) * 5
-        # Back wing
-        back_wing_points = [
-            (self.x - self.size//2 - 5, self.y + self.size//2),
-            (self.x - self.size//4 - 5, self.y + wing_offset + 5),
-            (self.x - 3*self.size//4 - 5, self.y + self.size//4 + wing_offset + 5)
-        ]
-        pygame.draw.polygon(screen, (220, 220, 205), back_wing_points)
-        # Front wing
-        front_wing_points = [
-            (self.x - self.size//2, self.y + self.size//2),
-            (self.x - self.size//4, self.y + wing_offset),
-            (self.x - 3*self.size//4, self.y + self.size//4 + wing_offset)
-        ]
-        pygame.draw.polygon(screen, BIRD_WHITE, front_wing_points)
-        
-        # Draw beak with detail
-        beak_points = [
-            (self.x + 2, self.y + self.size//2),
-            (self.x - self.size//4, self.y + self.size//3),
-            (self.x - self.size//4, self.y + 2*self.size//3)
-        ]
-        pygame.draw.polygon(screen, BIRD_ORANGE, beak_points)
-        pygame.draw.line(screen, (200, 100, 0), 
-                        (self.x - self.size//4, self.y + self.size//2),
-                        (self.x + 2, self.y + self.size//2), 2)
-        
-        # Draw eye with detail
-        pygame.draw.circle(screen, WHITE, (self.x - self.size//3, self.y + self.size//2), 4)
-        pygame.draw.circle(screen, BLACK, (self.x - self.size//3, self.y + self.size//2), 2)
+        # One blit from the shared sprite atlas, pixel-identical to draw_bird()
+        return bird_sprites.draw(screen, self.x, self.y, self.wing_angle)
 
 class Pipe:
-    def __init__(self, difficulty_level=0):
-        self.gap_y = random.randint(200, SCREEN_HEIGHT - 200)
+    def __init__(self, difficulty_level=0, gap_y=None):
+        if gap_y is None:
+            gap_y = random.randint(GAP_Y_MIN, GAP_Y_MAX)
+        self.gap_y = gap_y
         self.x = SCREEN_WIDTH
-        self.width = 50
-        # Decrease gap size more gradually
-        self.gap_size = max(150, 200 - (difficulty_level * 5))  # Changed from 10 to 5, min from 100 to 150
-        # Increase speed more gradually
-        self.speed = INITIAL_PIPE_SPEED + (difficulty_level * 0.25)  # Changed from 0.5 to 0.25
+        self.width = PIPE_WIDTH
+        # Gap size and speed follow the difficulty schedule in physics.py
+        self.gap_size = pipe_gap_size(difficulty_level)
+        self.speed = pipe_speed(difficulty_level)
         self.passed = False
 
     def update(self):
         self.x -= self.speed
 
     def draw(self, screen):
+        # Blit the pipe body rendered once for this gap geometry
+        return pipe_surfaces.draw(screen, self.x, self.gap_y, self.gap_size)
+
+    @staticmethod
+    def render(screen, x, gap_y, gap_size, width=PIPE_WIDTH):
         # Draw pipes with texture
-        top_height = self.gap_y - self.gap_size // 2
-        bottom_start = self.gap_y + self.gap_size // 2
+        top_height = gap_y - gap_size // 2
+        bottom_start = gap_y + gap_size // 2
         
         # Draw main pipes
-        pygame.draw.rect(screen, PIPE_GREEN, (self.x, 0, self.width, top_height))
-        pygame.draw.rect(screen, PIPE_GREEN, (self.x, bottom_start, self.width, SCREEN_HEIGHT - bottom_start))
+        pygame.draw.rect(screen, PIPE_GREEN, (x, 0, width, top_height))
+        pygame.draw.rect(screen, PIPE_GREEN, (x, bottom_start, width, SCREEN_HEIGHT - bottom_start))
         
         # Add pipe texture (vertical stripes)
-        for x in range(int(self.x), int(self.x + self.width), 10):
-            pygame.draw.line(screen, PIPE_DARK, (x, 0), (x, top_height), 2)
-            pygame.draw.line(screen, PIPE_DARK, (x, bottom_start), (x, SCREEN_HEIGHT), 2)
+        for stripe_x in range(x, x + width, 10):
+            pygame.draw.line(screen, PIPE_DARK, (stripe_x, 0), (stripe_x, top_height), 2)
+            pygame.draw.line(screen, PIPE_DARK, (stripe_x, bottom_start), (stripe_x, SCREEN_HEIGHT), 2)
 
     def collides_with(self, bird):
         bird_rect = pygame.Rect(bird.x - bird.size, bird.y, bird.size, bird.size)
@@ -150,20 +119,67 @@ class Pipe:
                                 self.width, SCREEN_HEIGHT - (self.gap_y + self.gap_size // 2))
         return bird_rect.colliderect(top_pipe) or bird_rect.colliderect(bottom_pipe)
 
+# Pipe bodies are rendered once per (gap_y, gap_size) and reused
+pipe_surfaces = PipeSurfaceCache(Pipe.render, PIPE_WIDTH)
+
 class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Flapping Bird AI")
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
+    def __init__(self, headless=False, seed=None, course=None, verbose=True):
+        self.headless = headless
+        self.verbose = verbose
+        # A seeded game always deals the same pipe course
+        if course is None and seed is not None:
+            course = Course(seed)
+        self.course = course
+        if headless:
+            # No window or frame clock: the simulation runs uncapped
+            self.screen = None
+            self.clock = None
+        else:
+            pygame.display.init()
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("Flapping Bird AI")
+            self.clock = pygame.time.Clock()
+            self.renderer = DirtyRectRenderer(self.screen, self.make_background())
         self.reset()
 
     def reset(self):
-        self.pipes = [Pipe(0)]  # Start with difficulty level 0
+        self.pipes = [self.new_pipe(0, 0)]  # Start with difficulty level 0
         self.score = 0
         self.frame_iteration = 0
         self.difficulty_level = 0
 
+    def score_pipe(self):
+        """Count a passed pipe and spawn the next one"""
+        self.score += 1
+        
+        # Increase difficulty every 15 points, with a maximum level
+        if self.score % DIFFICULTY_STEP_SCORE == 0:
+            # Cap difficulty at level 5 to prevent it from becoming too hard
+            if self.difficulty_level < MAX_DIFFICULTY:
+                self.difficulty_level += 1
+                if self.verbose:
+                    print(f"\nDifficulty increased! Level: {self.difficulty_level}")
+                    print(f"Gap size: {pipe_gap_size(self.difficulty_level)}, Speed: {pipe_speed(self.difficulty_level)}")
+        
+        # Create new pipe with current difficulty level
+        self.pipes.append(self.new_pipe(self.score, self.difficulty_level))
+
+    def new_pipe(self, index, difficulty_level):
+        """Deal the index-th pipe, from the course table when there is one"""
+        if self.course is None:
+            return Pipe(difficulty_level)
+        # The course follows the same difficulty schedule, so only gap_y is needed
+        return Pipe(difficulty_level, self.course.gap_y(index))
+
+    def set_pipes(self, pipes):
+        """Replace the pipes with ``(x, gap_y, gap_size)`` tuples, for viewers"""
+        self.pipes = []
+        for x, gap_y, gap_size in pipes:
+            pipe = Pipe(0, gap_y)
+            pipe.gap_size = gap_size
+            pipe.x = x
+            self.pipes.append(pipe)
+
     def update_fitness(self, birds):
         # Update fitness for each bird based on survival time and pipe passing
         for bird in birds:
@@ -176,49 +192,60 @@ class Game:
                         vertical_distance = abs(bird.y - pipe.gap_y)
                         bird.fitness += (100 - vertical_distance) / 100  # More reward for staying centered
 
-    def draw(self, birds, generation):
-        # Draw background
-        self.screen.fill(SKY_BLUE)
+    def make_background(self):
+        """Bake the static sky and ground into one surface"""
+        background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        background.fill(SKY_BLUE)
         
         # Draw ground
-        pygame.draw.rect(self.screen, GRASS_GREEN, (0, SCREEN_HEIGHT - 20, SCREEN_WIDTH, 20))
+        pygame.draw.rect(background, GRASS_GREEN, (0, SCREEN_HEIGHT - 20, SCREEN_WIDTH, 20))
         for i in range(0, SCREEN_WIDTH, 30):
             points = [(i, SCREEN_HEIGHT - 20), (i + 15, SCREEN_HEIGHT - 30), (i + 30, SCREEN_HEIGHT - 20)]
-            pygame.draw.polygon(self.screen, GRASS_DARK, points)
+            pygame.draw.polygon(background, GRASS_DARK, points)
+        return background.convert()
+
+    def draw(self, birds, generation, alive=None):
+        # Restore the background where the last frame drew
+        renderer = self.renderer
+        renderer.begin()
         
         # Draw pipes
         for pipe in self.pipes:
-            pipe.draw(self.screen)
+            renderer.add(pipe.draw(self.screen))
         
         # Draw birds
         for bird in birds:
             if bird.alive:
-                bird.draw(self.screen)
+                renderer.add(bird.draw(self.screen))
         
-        # Draw stats
-        score_text = self.font.render(f'Score: {self.score}', True, BLACK)
-        gen_text = self.font.render(f'Generation: {generation}', True, BLACK)
-        alive_text = self.font.render(f'Alive: {sum(1 for bird in birds if bird.alive)}', True, BLACK)
+        # Draw stats (only rendered again when a value changes)
+        score_text = text_cache.render(f'Score: {self.score}', BLACK)
+        gen_text = text_cache.render(f'Generation: {generation}', BLACK)
+        if alive is None:
+            alive = sum(1 for bird in birds if bird.alive)
+        alive_text = text_cache.render(f'Alive: {alive}', BLACK)
         
-        self.screen.blit(score_text, (10, 10))
-        self.screen.blit(gen_text, (10, 50))
-        self.screen.blit(alive_text, (10, 90))
+        renderer.add(self.screen.blit(score_text, (10, 10)))
+        renderer.add(self.screen.blit(gen_text, (10, 50)))
+        renderer.add(self.screen.blit(alive_text, (10, 90)))
         
-        pygame.display.flip()
+        # Push only the changed parts of the screen
+        renderer.present()
 
 def save_checkpoint(genome, score, generation):
     """Save a checkpoint of the model when reaching significant scores"""
+    from checkpoint import default_writer
     filename = f"checkpoint_gen{generation}_score{score}.pkl"
-    with open(filename, "wb") as f:
-        pickle.dump(genome, f)
+    # Pickling one genome is cheap; the disk write happens off the game loop
+    default_writer().submit(filename, pickle.dumps(genome))
     print(f"\nCheckpoint saved! Generation: {generation}, Score: {score}")
 
-def eval_genomes(genomes, config):
+def eval_genomes(genomes, config, headless=False, budget=None, probe=NULL_PROBE, spectator=None,
+                 recorder=None, decision_interval=1, seed=None):
     global GENERATION
     GENERATION += 1
     
-    # Create neural networks and birds
-    nets = []
+    # Create birds and one batched network for the whole population
     birds = []
     ge = []
     
@@ -226,123 +253,320 @@ def eval_genomes(genomes, config):
     checkpoint_saved = False
     
     for genome_id, genome in genomes:
-        net = neat.nn.FeedForwardNetwork.create(genome, config)
-        nets.append(net)
-        birds.append(Bird(SCREEN_WIDTH // 3, SCREEN_HEIGHT // 2))
+        if not headless:
+            birds.append(Bird(SCREEN_WIDTH // 3, SCREEN_HEIGHT // 2))
         genome.fitness = 0
         ge.append(genome)
+    nets = BatchedNetwork(ge, config)
 
-    # Create game instance
-    game = Game()
+    def activate(inputs, rows):
+        return nets.activate(inputs, rows)[:, 0]
+
+    # Create game instance; the whole population is simulated as arrays.
+    # A seeded game deals the same course every generation; a recorded
+    # generation always plays a seeded course so it can be replayed.
+    if seed is None and recorder is not None:
+        seed = random.randrange(2**32)
+    game = Game(headless, seed=seed)
+    flaps = FlapRecorder(len(ge)) if recorder is not None else None
+    sim = PopulationSim(len(ge), game, probe=probe, recorder=flaps, decision_interval=decision_interval)
+    if budget is None:
+        budget = GenerationBudget()
+    budget.start()
     
     # Game loop
     running = True
-    while running and any(bird.alive for bird in birds):
-        game.frame_iteration += 1
-        
+    while running and sim.any_alive() and not budget.exhausted(sim):
         # Handle events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-        
-        # Get pipe index for neural network input
-        pipe_idx = 0
-        if len(game.pipes) > 1 and game.pipes[0].x < birds[0].x:
-            pipe_idx = 1
-        
-        # Update each bird
-        for x, bird in enumerate(birds):
-            if bird.alive:
-                bird.update()
-                ge[x].fitness += 0.1
-                
-                # Neural network inputs
-                output = nets[x].activate((
-                    bird.y,
-                    abs(bird.y - game.pipes[pipe_idx].gap_y),
-                    abs(bird.x - game.pipes[pipe_idx].x)
-                ))
-                
-                if output[0] > 0.5:
-                    bird.flap()
-        
-        # Update pipes
-        rem = []
-        add_pipe = False
-        for pipe in game.pipes:
-            pipe.update()
-            
-            # Check collisions
-            for x, bird in enumerate(birds):
-                if bird.alive and pipe.collides_with(bird):
-                    bird.alive = False
-                
-                if bird.alive and not pipe.passed and pipe.x < bird.x:
-                    pipe.passed = True
-                    add_pipe = True
-            
-            if pipe.x + pipe.width < 0:
-                rem.append(pipe)
-        
-        if add_pipe:
-            game.score += 1
-            
-            # Increase difficulty every 15 points, with a maximum level
-            if game.score % 15 == 0:
-                # Cap difficulty at level 5 to prevent it from becoming too hard
-                if game.difficulty_level < 5:
-                    game.difficulty_level += 1
-                    print(f"\nDifficulty increased! Level: {game.difficulty_level}")
-                    print(f"Gap size: {200 - (game.difficulty_level * 5)}, Speed: {INITIAL_PIPE_SPEED + (game.difficulty_level * 0.25)}")
-            
-            for genome in ge:
-                genome.fitness += 5
-            
-            # Create new pipe with current difficulty level
-            game.pipes.append(Pipe(game.difficulty_level))
+        if not headless:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
         
-        for pipe in rem:
-            game.pipes.remove(pipe)
+        # Physics, network decisions, collisions, pipe passing and fitness
+        sim.step(activate)
         
-        # Update fitness based on performance
-        game.update_fitness(birds)
+        # Draw game state (headless training skips rendering and frame capping)
+        if not headless:
+            t = probe.clock()
+            sim.sync_birds(birds)
+            game.draw(birds, GENERATION)
+            t = probe.lap("render", t)
+            game.clock.tick(60)
+            probe.lap("tick", t)
         
-        # Draw game state
-        game.draw(birds, GENERATION)
-        game.clock.tick(60)
+        # Hand a snapshot to the spectator, which drops what it can't draw
+        if spectator is not None:
+            t = probe.clock()
+            spectator.publish(sim, GENERATION)
+            probe.lap("render", t)
         
         # Save checkpoint when score reaches 100
         if game.score >= 100 and not checkpoint_saved:
             # Find the best performing genome
-            best_genome = None
-            best_fitness = float('-inf')
-            for x, genome in enumerate(ge):
-                if genome.fitness > best_fitness:
-                    best_fitness = genome.fitness
-                    best_genome = genome
-            
-            if best_genome:
-                save_checkpoint(best_genome, game.score, GENERATION)
-                checkpoint_saved = True
+            best = int(sim.fitness.argmax())
+            best_genome = ge[best]
+            best_genome.fitness = float(sim.fitness[best])
+            save_checkpoint(best_genome, game.score, GENERATION)
+            checkpoint_saved = True
+    
+    if budget.reason is not None:
+        print(f"\nGeneration stopped after {game.frame_iteration} frames ({budget.reason})")
+    budget.normalize(sim)
+    for genome, fitness in zip(ge, sim.fitness.tolist()):
+        genome.fitness = fitness
+    if recorder is not None:
+        recorder.write_population(GENERATION, [genome_id for genome_id, _ in genomes], seed,
+                                  flaps, sim.fitness.tolist())
 
-def run_neat(config_path):
-    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
-                        neat.DefaultSpeciesSet, neat.DefaultStagnation,
-                        config_path)
+def evaluate_course(genomes, config, course, budget=None, decision_interval=1):
+    """Play genomes headless on a pipe course.
+    
+    Returns their fitness and the run's frame and activation counters
+    (see instrumentation.COUNTERS), which a parent process adds to its probe.
+    Pipe rewards only go to birds that are alive to pass the pipe, so a
+    genome's fitness does not depend on which other genomes share the run.
+    Of the budget limits only max_frames keeps that true, so training
+    only passes frame limits here (see parse_args).
+    """
+    game = Game(headless=True, course=course, verbose=False)
+    probe = Probe()
+    sim = PopulationSim(len(genomes), game, shared_pipe_reward=False, probe=probe,
+                        decision_interval=decision_interval)
+    nets = BatchedNetwork(genomes, config)
+    if budget is None:
+        budget = GenerationBudget()
+    budget.start()
     
-    pop = neat.Population(config)
+    def activate(inputs, rows):
+        return nets.activate(inputs, rows)[:, 0]
+    
+    while sim.any_alive() and not budget.exhausted(sim):
+        sim.step(activate)
+    budget.normalize(sim)
+    return sim.fitness.tolist(), probe.counters
+
+def aggregate_fitness(fitness, aggregate="mean"):
+    """Combine a (genomes, courses) fitness matrix into one value per genome.
+    
+    ``aggregate`` is "mean", "min" or a quantile between 0 and 1.
+    """
+    if aggregate == "mean":
+        return fitness.mean(axis=1)
+    if aggregate == "min":
+        return fitness.min(axis=1)
+    return np.quantile(fitness, float(aggregate), axis=1)
+
+def evaluate_courses(genomes, config, seeds, aggregate="mean", budget=None, decision_interval=1):
+    """Play every genome on every course in ``seeds`` and aggregate its fitness.
+    
+    All genome x course games run as one batch in a VectorEnv, so K courses
+    cost about as much wall-clock time as one.  Rewards are the individual
+    ones of evaluate_course; of the budget limits only max_frames applies.
+    Returns the fitness and counters like evaluate_course; a frame is one
+    step of the whole batch.
+    """
+    num_courses = len(seeds)
+    # Row g * K + k is genome g playing course k
+    nets = BatchedNetwork(genomes, config).repeat(num_courses)
+    env = VectorEnv(len(genomes) * num_courses)
+    obs = env.reset(list(seeds) * len(genomes))
+    fitness = np.zeros(env.num_envs)
+    done = np.zeros(env.num_envs, dtype=bool)
+    max_frames = budget.max_frames if budget is not None else None
+    frames = 0
+    # Held between decisions, which come every decision_interval frames
+    actions = np.zeros(env.num_envs, dtype=bool)
+    activations = 0
+    alive_bird_frames = 0
+    
+    while not done.all() and (max_frames is None or frames < max_frames):
+        if frames % decision_interval == 0:
+            rows = np.flatnonzero(env.started)
+            actions[rows] = nets.activate(obs[rows], rows)[:, 0] > 0.5
+            activations += len(rows)
+        alive_bird_frames += int(np.count_nonzero(env.started))
+        obs, rewards, done, _ = env.step(actions)
+        fitness += rewards
+        frames += 1
+    counters = {"frames": frames, "activations": activations, "alive_bird_frames": alive_bird_frames}
+    return aggregate_fitness(fitness.reshape(len(genomes), num_courses), aggregate).tolist(), counters
+
+def assign_fitness(genomes, config, evaluate, probe=NULL_PROBE):
+    """NEAT fitness function around an ``evaluate(genomes, config)`` like evaluate_course.
+    
+    ``evaluate`` returns the fitness list and counters, which go to ``probe``.
+    """
+    genomes = [genome for _, genome in genomes]
+    fitnesses, counters = evaluate(genomes, config)
+    for genome, fitness in zip(genomes, fitnesses):
+        genome.fitness = fitness
+    for counter, n in counters.items():
+        probe.count(counter, n)
+
+def run_neat(config_path, headless=False, workers=0, seed=0,
+             max_frames=None, max_seconds=None, early_stop=False,
+             checkpoint_every=5, checkpoint_seconds=300, resume_from=None,
+             profile_path=None, courses=1, aggregate="mean",
+             spectate=False, top_k=None, spectate_fps=30, record_path=None,
+             islands=0, migration_interval=5, migrants=2, topology="ring", fitness_cache=4096,
+             decision_interval=1, telemetry_port=None):
+    global GENERATION
+    if islands > 1:
+        run_islands(config_path, islands, seed=seed, max_frames=max_frames, courses=courses,
+                    aggregate=aggregate, interval=migration_interval, migrants=migrants,
+                    topology=topology, fitness_cache=fitness_cache, decision_interval=decision_interval)
+        return
+    # The reporters subclass neat classes, so load them with neat
+    from checkpoint import PopulationCheckpointer, default_writer, restore_checkpoint
+    from phase_reporter import PhaseReporter
+    from fitness_cache import FitnessCache, CachedFitness, FitnessCacheReporter
+    if resume_from:
+        # Continue a previous run from its population checkpoint
+        pop, stats = restore_checkpoint(resume_from)
+        config = pop.config
+        GENERATION = pop.generation
+        print(f"Resuming from {resume_from} at generation {pop.generation}")
+    else:
+        config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                            neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                            config_path)
+        pop = neat.Population(config)
+        stats = neat.StatisticsReporter()
+    
+    # Bound how long a single generation may run
+    threshold = config.fitness_threshold if config.fitness_criterion in ("max", "mean") else None
+    budget = GenerationBudget(max_frames, max_seconds,
+                              threshold if early_stop and config.fitness_criterion == "max" else None,
+                              stop_when_ranked=early_stop, projection_ceiling=threshold)
+    # Shards and batched courses stop on frame limits alone, the same way in every process
+    frame_budget = GenerationBudget(max_frames)
     
     # Add reporters for stats
     pop.add_reporter(neat.StdOutReporter(True))
-    stats = neat.StatisticsReporter()
     pop.add_reporter(stats)
+    checkpointer = PopulationCheckpointer(pop, stats, checkpoint_every, checkpoint_seconds)
+    pop.add_reporter(checkpointer)
+    # Per-phase timings of each generation (single-process evaluation only)
+    probe = Probe() if profile_path or telemetry_port is not None else NULL_PROBE
+    profiler = None
+    if profile_path:
+        profiler = PhaseReporter(probe, profile_path)
+        pop.add_reporter(profiler)
+    # Metrics for Prometheus, served on localhost from a background thread
+    telemetry = None
+    if telemetry_port is not None:
+        from telemetry import TelemetryReporter
+        telemetry = TelemetryReporter(telemetry_port, probe, checkpointer)
+        pop.add_reporter(telemetry)
+        print(f"Serving metrics on http://127.0.0.1:{telemetry.port}/metrics")
+    # Genomes already scored on the same seeded course(s) are not simulated again
+    cache = FitnessCache(fitness_cache) if fitness_cache > 0 else None
+    if cache is not None:
+        pop.add_reporter(FitnessCacheReporter(cache))
+    
+    def cached(fitness_function, course_key):
+        if cache is None or course_key is None:
+            return fitness_function
+        return CachedFitness(fitness_function, cache, course_key)
+    
+    generations = max(0, NUM_GENERATIONS - pop.generation)
     
-    # Run evolution
-    winner = pop.run(eval_genomes, 50)
+    # Run evolution, either in this process or sharded across a process pool
+    try:
+        if courses > 1:
+            # Every genome plays the same K seeded courses, batched together
+            seeds = [seed + k for k in range(courses)]
+            evaluate = functools.partial(evaluate_courses, seeds=seeds, aggregate=aggregate, budget=frame_budget,
+                                         decision_interval=decision_interval)
+            course_key = ("courses", tuple(seeds), aggregate, max_frames, decision_interval)
+            if workers > 0:
+                evaluator = ParallelEvaluator(workers, evaluate, probe=probe)
+                try:
+                    winner = pop.run(cached(evaluator.evaluate, course_key), generations)
+                finally:
+                    evaluator.close()
+            else:
+                winner = pop.run(cached(functools.partial(assign_fitness, evaluate=evaluate, probe=probe),
+                                        course_key),
+                                 generations)
+        elif workers > 0:
+            # Workers map the shared course table instead of regenerating it
+            course = Course(seed).share()
+            evaluate = functools.partial(evaluate_course, course=course, budget=frame_budget,
+                                         decision_interval=decision_interval)
+            evaluator = ParallelEvaluator(workers, evaluate, probe=probe)
+            course_key = ("course", seed, max_frames, decision_interval)
+            try:
+                winner = pop.run(cached(evaluator.evaluate, course_key), generations)
+            finally:
+                evaluator.close()
+                course.close()
+        else:
+            # A spectator draws on this thread while the simulation runs uncapped on a worker
+            spectator = SpectatorView(Game, Bird, top_k, spectate_fps) if spectate else None
+            # Every genome's run goes to the replay log as a seed plus flap bits
+            recorder = ReplayWriter(record_path) if record_path else None
+            train = functools.partial(pop.run, functools.partial(eval_genomes, headless=headless or spectate,
+                                                                 budget=budget, probe=probe, spectator=spectator,
+                                                                 recorder=recorder, seed=seed,
+                                                                 decision_interval=decision_interval),
+                                      generations)
+            try:
+                winner = spectator.run(train) if spectator is not None else train()
+            finally:
+                if recorder is not None:
+                    recorder.close()
+    finally:
+        if profiler is not None:
+            profiler.close()
+        if telemetry is not None:
+            telemetry.close()
+        # Let pending checkpoint writes reach the disk
+        checkpointer.close()
+        default_writer().flush()
+    save_winner(winner, config)
+
+def run_islands(config_path, islands, seed=0, max_frames=None, courses=1, aggregate="mean",
+                interval=5, migrants=2, topology="ring", fitness_cache=4096, decision_interval=1):
+    """Evolve several populations in parallel processes that swap their best genomes"""
+    from islands import IslandModel
+    from fitness_cache import FitnessCache, CachedFitness
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                        neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                        config_path)
+    # Every island plays the same seeded course(s), so fitness compares across islands
+    budget = GenerationBudget(max_frames)
+    course = None
+    if courses > 1:
+        seeds = [seed + k for k in range(courses)]
+        evaluate = functools.partial(evaluate_courses, seeds=seeds, aggregate=aggregate, budget=budget,
+                                     decision_interval=decision_interval)
+        course_key = ("courses", tuple(seeds), aggregate, max_frames, decision_interval)
+    else:
+        course = Course(seed).share()
+        evaluate = functools.partial(evaluate_course, course=course, budget=budget,
+                                     decision_interval=decision_interval)
+        course_key = ("course", seed, max_frames, decision_interval)
+    fitness_function = functools.partial(assign_fitness, evaluate=evaluate)
+    if fitness_cache > 0:
+        # Every island gets its own copy of the (empty) cache
+        fitness_function = CachedFitness(fitness_function, FitnessCache(fitness_cache), course_key)
+    model = IslandModel(config_path, fitness_function, islands, interval, migrants, topology, seed)
+    try:
+        winner = model.run(NUM_GENERATIONS)
+    finally:
+        if course is not None:
+            course.close()
+    save_winner(winner, config)
+
+def save_winner(winner, config):
+    """Keep the winner as a genome pickle and as the compiled play-mode model"""
     print('\nBest genome:\n{!s}'.format(winner))
     with open("best_genome.pkl", "wb") as f:
         pickle.dump(winner, f)
+    export_network(winner, config, MODEL_PATH)
 
 
 def load_best_genome(config):
@@ -355,11 +579,37 @@ def load_best_genome(config):
         print("No saved model found. Please train first.")
         return None
 
-def run_winner(config, genome):
-    """Run the game with the best genome"""
-    net = neat.nn.FeedForwardNetwork.create(genome, config)
+def load_winner(config_path):
+    """Network to play with: the compiled model, else the pickled genome"""
+    if os.path.exists(MODEL_PATH):
+        # No neat, config parsing or unpickling needed
+        return load_network(MODEL_PATH)
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                        neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                        config_path)
+    genome = load_best_genome(config)
+    if genome is None:
+        return None
+    return neat.nn.FeedForwardNetwork.create(genome, config)
+
+def export_winner(config_path):
+    """Compile best_genome.pkl into the play-mode model file"""
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                        neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                        config_path)
+    genome = load_best_genome(config)
+    if genome is None:
+        return False
+    export_network(genome, config, MODEL_PATH)
+    print(f"Exported the best genome to {MODEL_PATH} ({os.path.getsize(MODEL_PATH)} bytes)")
+    return True
+
+def run_winner(net, decision_interval=1):
+    """Run the game with the best network, asking it for a decision every k frames"""
     bird = Bird(SCREEN_WIDTH // 3, SCREEN_HEIGHT // 2)
     game = Game()
+    frame = 0
+    flap = False
     
     while True:
         for event in pygame.event.get():
@@ -371,13 +621,17 @@ def run_winner(config, genome):
         if len(game.pipes) > 1 and game.pipes[0].x < bird.x:
             pipe_idx = 1
             
-        output = net.activate((
-            bird.y,
-            abs(bird.y - game.pipes[pipe_idx].gap_y),
-            abs(bird.x - game.pipes[pipe_idx].x)
-        ))
+        # The last decision is repeated until the next one is due
+        if frame % decision_interval == 0:
+            output = net.activate((
+                bird.y,
+                abs(bird.y - game.pipes[pipe_idx].gap_y),
+                abs(bird.x - game.pipes[pipe_idx].x)
+            ))
+            flap = output[0] > 0.5
+        frame += 1
         
-        if output[0] > 0.5:
+        if flap:
             bird.flap()
             
         # Update game state
@@ -386,18 +640,137 @@ def run_winner(config, genome):
         game.draw([bird], "Best Model")
         game.clock.tick(60)
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Train or watch the Flapping Bird NEAT AI")
+    parser.add_argument("mode", nargs="?", default="train", choices=["train", "play", "resume", "export"],
+                        help="train a new population (default), watch the best genome, "
+                             "resume training from a checkpoint or compile best_genome.pkl "
+                             f"into {MODEL_PATH} for play mode")
+    parser.add_argument("checkpoint", nargs="?", default=None,
+                        help="checkpoint to resume from (default: the newest one)")
+    parser.add_argument("--headless", action="store_true",
+                        help="train without a window, as fast as the CPU allows")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="evaluate genomes headless across this many processes (not with --islands)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="pipe course seed every generation is played on")
+    parser.add_argument("--max-frames", type=int, default=None,
+                        help="stop each generation after this many frames")
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="stop each generation after this much wall-clock time; needs "
+                             "--max-frames, onto which the survivors' fitness is projected "
+                             "(not with --workers, --courses or --islands)")
+    parser.add_argument("--early-stop", action="store_true",
+                        help="stop a generation once the fitness threshold is reached "
+                             "or the ranking can no longer change (not with --workers, --courses or --islands)")
+    parser.add_argument("--checkpoint-every", type=int, default=5,
+                        help="save a population checkpoint every N generations (0 disables; not with --islands)")
+    parser.add_argument("--checkpoint-seconds", type=float, default=300,
+                        help="save a population checkpoint every T seconds (0 disables; not with --islands)")
+    parser.add_argument("--spectate", action="store_true",
+                        help="train at full speed on a worker thread and watch it in a window "
+                             "that skips frames when it falls behind (not with --workers, --courses "
+                             "or --islands)")
+    parser.add_argument("--top-k", type=int, default=10,
+                        help="number of live birds the spectator view shows (0 for all)")
+    parser.add_argument("--spectate-fps", type=int, default=30,
+                        help="frame rate of the spectator view")
+    parser.add_argument("--courses", type=int, default=1,
+                        help="score every genome on this many seeded courses (seed, seed+1, ...) "
+                             "in one headless batch")
+    parser.add_argument("--aggregate", default="mean",
+                        help="how --courses combines per-course fitness: mean, min or a "
+                             "quantile such as 0.25")
+    parser.add_argument("--profile", metavar="PATH", default=None,
+                        help="write per-generation phase timings and counters to PATH "
+                             "(.csv for CSV, otherwise JSON lines; not with --workers or --islands)")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="append every genome's run to the replay log PATH "
+                             "(see replay.py; not with --workers, --courses or --islands)")
+    parser.add_argument("--islands", type=int, default=0,
+                        help="evolve this many populations in separate processes that exchange "
+                             "their best genomes (island model, headless; not with --workers or "
+                             "checkpoint options)")
+    parser.add_argument("--migration-interval", type=int, default=5,
+                        help="generations between island migrations")
+    parser.add_argument("--migrants", type=int, default=2,
+                        help="best genomes each island sends per migration")
+    parser.add_argument("--topology", default="ring", choices=["ring", "complete", "random"],
+                        help="which islands receive each island's migrants")
+    parser.add_argument("--fitness-cache", type=int, default=4096,
+                        help="remember the fitness of up to N genomes so unchanged ones skip "
+                             "simulation (seeded courses: --workers, --courses, --islands; 0 disables)")
+    parser.add_argument("--decision-interval", type=int, default=1, metavar="K",
+                        help="query the networks every K frames and repeat their last flap "
+                             "decision in between (training and play)")
+    parser.add_argument("--telemetry", type=int, metavar="PORT", default=None,
+                        help="serve Prometheus metrics (fitness, species, frames/s, checkpoint age) "
+                             "on http://127.0.0.1:PORT/metrics; frame and activation rates only count "
+                             "genomes that were simulated, not fitness cache hits (not with --islands)")
+    args = parser.parse_args(argv)
+    # Island runs keep their own per-island populations and reporters
+    if (args.telemetry is not None or args.profile) and args.islands:
+        parser.error("--telemetry and --profile do not support island runs")
+    if args.islands and args.workers > 0:
+        parser.error("--islands runs one process per island and does not take --workers")
+    if args.islands and (args.checkpoint_every != parser.get_default("checkpoint_every")
+                         or args.checkpoint_seconds != parser.get_default("checkpoint_seconds")):
+        parser.error("island runs do not write population checkpoints; drop --checkpoint-every "
+                     "and --checkpoint-seconds")
+    if args.decision_interval < 1:
+        parser.error("--decision-interval must be at least 1")
+    if args.islands == 1 or args.islands < 0:
+        parser.error("--islands needs at least two islands")
+    if args.islands and args.mode == "resume":
+        parser.error("island runs can not be resumed from a checkpoint")
+    # A clock stop projects fitness onto the frame limit, so every bird is scored on one horizon
+    if args.max_seconds is not None and args.max_frames is None:
+        parser.error("--max-seconds needs --max-frames, the horizon cut-short generations are scored on")
+    # Shards, batched courses and islands only honour frame limits, which keep runs repeatable
+    if (args.max_seconds is not None or args.early_stop) and (args.workers > 0 or args.courses > 1 or args.islands):
+        parser.error("--max-seconds and --early-stop do not work with --workers, --courses or --islands; "
+                     "bound generations with --max-frames")
+    for flag, value in (("--record", args.record), ("--spectate", args.spectate)):
+        if value and (args.workers > 0 or args.courses > 1 or args.islands):
+            parser.error(f"{flag} only works with single-process, single-course training")
+    if args.aggregate not in ("mean", "min"):
+        try:
+            quantile = float(args.aggregate)
+        except ValueError:
+            quantile = -1
+        if not 0 <= quantile <= 1:
+            parser.error("--aggregate must be mean, min or a quantile between 0 and 1")
+    return args
+
 if __name__ == "__main__":
+    args = parse_args()
     local_dir = os.path.dirname(__file__)
     config_path = os.path.join(local_dir, "config-feedforward.txt")
-    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
-                        neat.DefaultSpeciesSet, neat.DefaultStagnation,
-                        config_path)
     
-    if len(sys.argv) > 1 and sys.argv[1] == "play":
-        # Play mode - load and run best genome
-        genome = load_best_genome(config)
-        if genome:
-            run_winner(config, genome)
+    if args.mode == "play":
+        # Play mode - load and run the best network
+        net = load_winner(config_path)
+        if net:
+            run_winner(net, args.decision_interval)
+    elif args.mode == "export":
+        if not export_winner(config_path):
+            sys.exit(1)
     else:
-        # Training mode
-        run_neat(config_path)
+        # Training mode, optionally continuing from a checkpoint
+        resume_from = None
+        if args.mode == "resume":
+            from checkpoint import latest_checkpoint
+            resume_from = args.checkpoint or latest_checkpoint()
+            if resume_from is None:
+                print("No checkpoint found. Please train first.")
+                sys.exit(1)
+        run_neat(config_path, headless=args.headless, workers=args.workers, seed=args.seed,
+                 max_frames=args.max_frames, max_seconds=args.max_seconds,
+                 early_stop=args.early_stop, checkpoint_every=args.checkpoint_every,
+                 checkpoint_seconds=args.checkpoint_seconds, resume_from=resume_from,
+                 profile_path=args.profile, courses=args.courses, aggregate=args.aggregate,
+                 spectate=args.spectate, top_k=args.top_k or None, spectate_fps=args.spectate_fps,
+                 record_path=args.record, islands=args.islands,
+                 migration_interval=args.migration_interval, migrants=args.migrants,
+                 topology=args.topology, fitness_cache=args.fitness_cache,
+                 decision_interval=args.decision_interval, telemetry_port=args.telemetry)
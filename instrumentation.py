@@ -0,0 +1,63 @@
+"""Per-phase timers and counters for the training loop.
+
+The simulation and the game loop report each phase of a frame to a probe:
+
+    t = probe.clock()
+    ...physics...
+    t = probe.lap("physics", t)
+
+``Probe`` accumulates the time spent in every phase plus event counters
+until it is reset.  ``NULL_PROBE`` has the same interface but does
+nothing, so uninstrumented runs only pay for a few empty method calls per
+frame.  The NEAT reporter that writes them out per generation lives in
+phase_reporter.py, so the simulator can use probes without importing neat.
+"""
+import time
+
+# Frame phases, in the order they happen
+PHASES = ("physics", "inference", "collisions", "shaping", "render", "tick")
+COUNTERS = ("frames", "activations", "alive_bird_frames")
+
+
+class Probe:
+    enabled = True
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.timings = dict.fromkeys(PHASES, 0.0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def clock(self):
+        return time.perf_counter()
+
+    def lap(self, phase, started):
+        """Charge the time since ``started`` to ``phase``; returns the current time."""
+        now = time.perf_counter()
+        self.timings[phase] = self.timings.get(phase, 0.0) + now - started
+        return now
+
+    def count(self, counter, n=1):
+        self.counters[counter] = self.counters.get(counter, 0) + n
+
+
+class NullProbe(Probe):
+    """A probe that records nothing."""
+    enabled = False
+
+    def reset(self):
+        self.timings = {}
+        self.counters = {}
+
+    def clock(self):
+        return 0.0
+
+    def lap(self, phase, started):
+        return 0.0
+
+    def count(self, counter, n=1):
+        pass
+
+
+NULL_PROBE = NullProbe()
@@ -0,0 +1,207 @@
+"""Island-model evolution across worker processes.
+
+Each island is a separate process that evolves its own ``neat.Population``
+from the same config, so speciation and reproduction run in parallel.
+Every ``interval`` generations the islands stop, send their best genomes
+to the hub (the parent process) and wait for its reply: the migrants the
+topology routes to them, which replace fresh offspring before the next
+generation is evaluated.  The hub also keeps a global archive of the best
+genomes seen on any island and writes it to disk after every epoch.
+
+Islands and hub only exchange picklable messages over multiprocessing
+queues and move in lockstep, so a run does not depend on process timing.
+
+NEAT matches genes by id, so every island draws the ids of new nodes from
+its own range (``NODE_ID_STRIDE`` apart).  Immigrants then never collide
+with nodes the receiving island creates later, and two nodes only line up
+in crossover when they really descend from the same gene.
+
+Topologies:
+    ring      island i sends to island i + 1
+    complete  every island sends to every other island
+    random    every island sends to one other island, picked per epoch
+"""
+import itertools
+import multiprocessing
+import pickle
+import queue
+import random
+from collections import namedtuple
+
+import neat
+
+from checkpoint import default_writer
+
+TOPOLOGIES = ("ring", "complete", "random")
+ARCHIVE_PATH = "island_archive.pkl"
+# Size of each island's block of node ids
+NODE_ID_STRIDE = 1 << 32
+
+ArchiveEntry = namedtuple("ArchiveEntry", "fitness island generation genome")
+# What an island sends the hub after each epoch
+Report = namedtuple("Report", "island generation emigrants best done")
+
+
+class _Emigrants(neat.reporting.BaseReporter):
+    """Remembers the best genomes of the last evaluated generation."""
+
+    def __init__(self, count):
+        self.count = count
+        self.best = []
+        self.keys = set()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        ranked = sorted(population.values(), key=lambda genome: genome.fitness, reverse=True)
+        self.best = ranked[:self.count]
+        # Elites carry over into the next generation and are never replaced
+        self.keys = set(population)
+
+
+def _island(index, config_path, fitness_function, generations, interval, migrants, seed,
+            inbox, outbox):
+    random.seed(f"island-{index}-{seed}")
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation, config_path)
+    genome_config = config.genome_config
+    genome_config.node_indexer = itertools.count(node_id_base(index, genome_config))
+    pop = neat.Population(config)
+    emigrants = _Emigrants(migrants)
+    pop.add_reporter(emigrants)
+
+    remaining = generations
+    while True:
+        n = min(interval, remaining)
+        start = pop.generation
+        pop.run(fitness_function, n)
+        remaining -= pop.generation - start
+        # pop.run returns early once the fitness threshold is reached
+        done = remaining <= 0 or pop.generation - start < n
+        outbox.put(Report(index, pop.generation, emigrants.best, pop.best_genome, done))
+
+        immigrants, stop = inbox.get()
+        if stop:
+            break
+        _settle(pop, immigrants, emigrants.keys)
+
+
+def node_id_base(index, genome_config):
+    """First id of island ``index``'s new nodes; the output nodes are shared."""
+    return genome_config.num_outputs + index * NODE_ID_STRIDE
+
+
+def _settle(pop, immigrants, evaluated):
+    """Swap immigrants in for fresh offspring of the next generation."""
+    offspring = [key for key in pop.population if key not in evaluated]
+    immigrants = immigrants[:len(offspring) // 2]
+    for key, genome in zip(random.sample(offspring, len(immigrants)), immigrants):
+        del pop.population[key]
+        # Keys are only unique within an island
+        genome.key = next(pop.reproduction.genome_indexer)
+        genome.fitness = None
+        pop.population[genome.key] = genome
+    if immigrants:
+        pop.species.speciate(pop.config, pop.population, pop.generation)
+
+
+def routes(topology, num_islands, rng=random):
+    """Destination islands of each island's migrants for one epoch."""
+    if topology == "ring":
+        return [[(i + 1) % num_islands] for i in range(num_islands)]
+    if topology == "complete":
+        return [[j for j in range(num_islands) if j != i] for i in range(num_islands)]
+    if topology == "random":
+        return [[rng.choice([j for j in range(num_islands) if j != i])] for i in range(num_islands)]
+    raise ValueError(f"Unknown topology {topology!r}, expected one of {', '.join(TOPOLOGIES)}")
+
+
+class IslandModel:
+    def __init__(self, config_path, fitness_function, num_islands=4, interval=5, migrants=2,
+                 topology="ring", seed=0, archive_path=ARCHIVE_PATH, archive_size=10):
+        """
+        ``fitness_function`` is the NEAT fitness function every island uses;
+        it must be picklable and give fitness values that are comparable
+        across islands (e.g. the same seeded course for everyone).
+        """
+        if num_islands < 2:
+            raise ValueError("The island model needs at least two islands")
+        routes(topology, num_islands)
+        self.config_path = config_path
+        self.fitness_function = fitness_function
+        self.num_islands = num_islands
+        self.interval = interval
+        self.migrants = migrants
+        self.topology = topology
+        self.seed = seed
+        self.archive_path = archive_path
+        self.archive_size = archive_size
+        self.archive = []
+        self.rng = random.Random(seed)
+
+    def run(self, generations):
+        """Evolve every island for ``generations``; returns the best genome found."""
+        context = multiprocessing.get_context()
+        outbox = context.Queue()
+        inboxes = [context.Queue() for _ in range(self.num_islands)]
+        processes = [
+            context.Process(target=_island, name=f"island-{i}",
+                            args=(i, self.config_path, self.fitness_function, generations,
+                                  self.interval, self.migrants, self.seed, inboxes[i], outbox))
+            for i in range(self.num_islands)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            stop = False
+            while not stop:
+                reports = sorted(self._collect(outbox, processes), key=lambda report: report.island)
+                self._update_archive(reports)
+                stop = any(report.done for report in reports)
+                # Route every island's emigrants in island order
+                arriving = [[] for _ in processes]
+                for report, destinations in zip(reports, routes(self.topology, self.num_islands, self.rng)):
+                    for j in destinations:
+                        arriving[j].extend(report.emigrants)
+                for inbox, immigrants in zip(inboxes, arriving):
+                    inbox.put((immigrants, stop))
+                print(f"\nGeneration {reports[0].generation}: island best "
+                      + ", ".join(f"{report.best.fitness:.1f}" for report in reports)
+                      + f"; archive best {self.archive[0].fitness:.1f}")
+        finally:
+            for process in processes:
+                process.join(timeout=10)
+                if process.is_alive():
+                    process.terminate()
+            default_writer().flush()
+        return self.archive[0].genome
+
+    @staticmethod
+    def _collect(outbox, processes):
+        """Wait for one report per island, failing if an island dies instead."""
+        reports = []
+        while len(reports) < len(processes):
+            try:
+                reports.append(outbox.get(timeout=1))
+            except queue.Empty:
+                for process in processes:
+                    if process.exitcode not in (None, 0):
+                        raise RuntimeError(f"{process.name} exited with code {process.exitcode}")
+        return reports
+
+    def _update_archive(self, reports):
+        seen = {(entry.island, entry.genome.key) for entry in self.archive}
+        for report in reports:
+            for genome in [report.best] + report.emigrants:
+                if (report.island, genome.key) not in seen:
+                    seen.add((report.island, genome.key))
+                    self.archive.append(ArchiveEntry(genome.fitness, report.island,
+                                                     report.generation, genome))
+        self.archive.sort(key=lambda entry: entry.fitness, reverse=True)
+        del self.archive[self.archive_size:]
+        if self.archive_path:
+            default_writer().submit(self.archive_path, pickle.dumps(self.archive))
+
+
+def load_archive(path=ARCHIVE_PATH):
+    """The archived ``ArchiveEntry`` list, best first."""
+    with open(path, "rb") as f:
+        return pickle.load(f)
@@ -0,0 +1,25 @@
+"""Deferred imports for heavy dependencies.
+
+pygame and neat take a large share of start-up time, and many entry points
+(headless workers, the vector environment, analysis scripts) never touch
+one or the other.  ``lazy_import`` returns a module object right away and
+only runs the real import the first time one of its attributes is used.
+"""
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """Return module ``name``, imported on first attribute access."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
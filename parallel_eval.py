@@ -0,0 +1,47 @@
+"""Multi-process genome evaluation.
+
+Shards a generation's genomes across a process pool.  The evaluation
+function plays each shard on the same seeded course and must give every
+genome a fitness that does not depend on its shard, so results are the
+same whatever the number of workers.  The shards' frame and activation
+counters are summed into the parent's probe.
+"""
+import multiprocessing
+
+from instrumentation import NULL_PROBE
+
+
+class ParallelEvaluator:
+    def __init__(self, num_workers, eval_function, shards_per_worker=1, probe=NULL_PROBE):
+        """
+        ``eval_function(genomes, config)`` takes a list of genomes and
+        returns their fitness values in the same order plus a dict of
+        counters for ``probe``.
+        """
+        self.num_workers = num_workers
+        self.eval_function = eval_function
+        self.shards_per_worker = shards_per_worker
+        self.probe = probe
+        self.pool = multiprocessing.Pool(num_workers)
+
+    def evaluate(self, genomes, config):
+        """NEAT fitness function: assigns ``fitness`` to every genome."""
+        genomes = [genome for _, genome in genomes]
+        num_shards = min(len(genomes), self.num_workers * self.shards_per_worker)
+        # Contiguous shards, so results come back in population order
+        bounds = [len(genomes) * i // num_shards for i in range(num_shards + 1)]
+        jobs = [self.pool.apply_async(self.eval_function, (genomes[start:end], config))
+                for start, end in zip(bounds, bounds[1:])]
+
+        fitnesses = []
+        for job in jobs:
+            shard, counters = job.get()
+            fitnesses.extend(shard)
+            for counter, n in counters.items():
+                self.probe.count(counter, n)
+        for genome, fitness in zip(genomes, fitnesses):
+            genome.fitness = fitness
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
@@ -0,0 +1,53 @@
+"""NEAT reporter that writes per-phase timings of each generation to a file."""
+import csv
+import json
+import time
+
+import neat
+
+from instrumentation import PHASES, COUNTERS
+
+
+class PhaseReporter(neat.reporting.BaseReporter):
+    """Writes the probe's per-generation timings and counters to a file.
+
+    The format follows the file extension: ``.csv`` gives one CSV row per
+    generation, anything else one JSON object per line.  Every line holds
+    the generation, the evaluation wall-clock time, the seconds spent in
+    each phase and the counters.
+    """
+
+    def __init__(self, probe, path):
+        self.probe = probe
+        self.path = path
+        self.csv = path.endswith(".csv")
+        self.file = open(path, "w", newline="" if self.csv else None)
+        self.writer = None
+        if self.csv:
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(("generation", "seconds") + PHASES + COUNTERS)
+        self.generation = None
+        self.started = None
+
+    def start_generation(self, generation):
+        self.generation = generation
+        self.started = time.perf_counter()
+        self.probe.reset()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        seconds = time.perf_counter() - self.started
+        timings = self.probe.timings
+        counters = self.probe.counters
+        if self.csv:
+            self.writer.writerow([self.generation, round(seconds, 6)]
+                                 + [round(timings.get(p, 0.0), 6) for p in PHASES]
+                                 + [counters.get(c, 0) for c in COUNTERS])
+        else:
+            record = {"generation": self.generation, "seconds": round(seconds, 6)}
+            record.update((p, round(t, 6)) for p, t in timings.items())
+            record.update(counters)
+            self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
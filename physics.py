@@ -0,0 +1,42 @@
+"""Game constants shared by the visual game and the training simulators."""
+
+# Screen
+SCREEN_WIDTH = 400
+SCREEN_HEIGHT = 600
+
+# Bird
+GRAVITY = 0.25
+FLAP_STRENGTH = -7
+BIRD_SIZE = 25
+BIRD_X = SCREEN_WIDTH // 3
+BIRD_START_Y = SCREEN_HEIGHT // 2
+WING_SPEED = 0.2
+
+# Pipes
+PIPE_WIDTH = 50
+INITIAL_PIPE_SPEED = 3
+DIFFICULTY_STEP_SCORE = 15  # Raise the difficulty every 15 points
+MAX_DIFFICULTY = 5  # Cap difficulty so the game never becomes impossible
+
+# Pipe gap centres are drawn uniformly from this range (inclusive)
+GAP_Y_MIN = 200
+GAP_Y_MAX = SCREEN_HEIGHT - 200
+
+
+def pipe_difficulty(index):
+    """Difficulty level of the index-th pipe of a training run.
+
+    Pipe 0 is dealt at level 0 and pipe k is spawned when the score reaches
+    k, so the level is the number of completed difficulty steps.
+    """
+    return min(MAX_DIFFICULTY, index // DIFFICULTY_STEP_SCORE)
+
+
+def pipe_gap_size(difficulty_level):
+    # Decrease gap size gradually (5 px per level), never below 150
+    return max(150, 200 - (difficulty_level * 5))
+
+
+def pipe_speed(difficulty_level):
+    # Increase speed gradually (0.25 px/frame per level)
+    return INITIAL_PIPE_SPEED + (difficulty_level * 0.25)
@@ -0,0 +1,284 @@
+"""Pre-rendered surfaces and partial screen updates for the game's drawing code.
+
+pygame.draw truncates float coordinates to whole pixels, so a bird drawn at
+``(x, y)`` only depends on the integer part of ``y``, its wing phase and
+whether the fractional parts of ``y`` and the wing offset carry into the
+next pixel.  BirdSpriteCache renders each of those variants once and then
+draws every bird with a single blit, giving pixel-identical output.
+
+DirtyRectRenderer keeps the static scenery in a pre-baked background
+surface, restores it only where something was drawn on the last frame and
+pushes just the changed rectangles to the display, and PipeSurfaceCache
+does the same for pipe bodies as BirdSpriteCache does for birds.
+TextCache keeps fonts and rendered HUD strings between frames.
+"""
+import math
+from collections import OrderedDict
+
+from lazy_import import lazy_import
+from physics import BIRD_SIZE, SCREEN_HEIGHT
+
+pygame = lazy_import("pygame")
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+BIRD_YELLOW = (255, 215, 0)
+BIRD_ORANGE = (255, 140, 0)  # For beak
+BIRD_WHITE = (255, 255, 240)  # For wing
+
+
+def draw_bird(screen, x, y, size, wing_angle):
+    """Draw a bird directly with pygame.draw (used to fill the sprite cache).
+
+    Returns the bounding rectangle of everything drawn.
+    """
+    rects = []
+    # Draw main body (gradient from yellow to lighter yellow)
+    for i in range(size//2):
+        color = (255, 215 + i, i)
+        rects.append(pygame.draw.circle(screen, color,
+                                        (x - size//2, y + size//2),
+                                        size//2 - i))
+
+    # Draw detailed tail feathers
+    tail_points = [
+        (x - size, y + size//2),  # Center
+        (x - size - 12, y + size//4),  # Top
+        (x - size - 15, y + size//2),  # Middle
+        (x - size - 12, y + 3*size//4)  # Bottom
+    ]
+    rects.append(pygame.draw.polygon(screen, BIRD_YELLOW, tail_points))
+    # Add tail detail lines
+    for i in range(3):
+        start = (x - size, y + size//2)
+        end = (x - size - 12, y + size//3 + i*size//3)
+        rects.append(pygame.draw.line(screen, (200, 160, 0), start, end, 2))
+
+    # Draw wings with smooth animation
+    wing_offset = math.sin(wing_angle) * 5
+    # Back wing (slightly darker)
+    back_wing_points = [
+        (x - size//2 - 5, y + size//2),  # Center
+        (x - size//4 - 5, y + wing_offset + 5),  # Top
+        (x - 3*size//4 - 5, y + size//4 + wing_offset + 5)  # Back
+    ]
+    rects.append(pygame.draw.polygon(screen, (220, 220, 205), back_wing_points))
+    # Front wing
+    front_wing_points = [
+        (x - size//2, y + size//2),  # Center
+        (x - size//4, y + wing_offset),  # Top
+        (x - 3*size//4, y + size//4 + wing_offset)  # Back
+    ]
+    rects.append(pygame.draw.polygon(screen, BIRD_WHITE, front_wing_points))
+
+    # Draw beak
+    beak_points = [
+        (x + 2, y + size//2),  # Tip
+        (x - size//4, y + size//3),  # Top
+        (x - size//4, y + 2*size//3)  # Bottom
+    ]
+    rects.append(pygame.draw.polygon(screen, BIRD_ORANGE, beak_points))
+    # Add beak detail
+    rects.append(pygame.draw.line(screen, (200, 100, 0),
+                                  (x - size//4, y + size//2),
+                                  (x + 2, y + size//2), 2))
+
+    # Add eye with detail
+    rects.append(pygame.draw.circle(screen, WHITE, (x - size//3, y + size//2), 4))
+    rects.append(pygame.draw.circle(screen, BLACK, (x - size//3, y + size//2), 2))
+    return rects[0].unionall(rects[1:])
+
+
+class BirdSpriteCache:
+    # Sprite canvas: the bird spans x-41..x+3 and y-5..y+25
+    WIDTH = 64
+    HEIGHT = 48
+    ORIGIN_X = 52
+    ORIGIN_Y = 12
+
+    def __init__(self, size=BIRD_SIZE, max_sprites=256):
+        self.size = size
+        self.max_sprites = max_sprites
+        self.sprites = {}
+        self.wing_offsets = {}
+
+    def draw(self, screen, x, y, wing_angle):
+        """Blit a bird that looks exactly like ``draw_bird(screen, x, y, ...)``.
+
+        Returns the rectangle of the screen that was drawn on.
+        """
+        wing_offset = self.wing_offsets.get(wing_angle)
+        if wing_offset is None:
+            wing_offset = math.sin(wing_angle) * 5
+            self.wing_offsets[wing_angle] = wing_offset
+
+        base_y = int(y)
+        if x != int(x) or y + wing_offset < 0:
+            # Off-grid x, or a wing above the top edge where truncation
+            # rounds towards zero instead of down: draw it the slow way
+            return draw_bird(screen, x, y, self.size, wing_angle)
+
+        frac = y - base_y
+        key = (wing_angle, math.floor(frac + wing_offset))
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self._render(frac, wing_angle)
+            if len(self.sprites) >= self.max_sprites:
+                self.sprites.clear()
+                self.wing_offsets.clear()
+            self.sprites[key] = sprite
+        return screen.blit(sprite, (int(x) - self.ORIGIN_X, base_y - self.ORIGIN_Y))
+
+    def _render(self, frac, wing_angle):
+        sprite = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
+        draw_bird(sprite, self.ORIGIN_X, self.ORIGIN_Y + frac, self.size, wing_angle)
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+        return sprite
+
+
+# Shared by every Bird so each variant is rendered once per process
+bird_sprites = BirdSpriteCache()
+
+
+class DirtyRectRenderer:
+    """Partial screen updates over a cached background.
+
+    Every frame: ``begin()`` restores the background under whatever was
+    drawn on the previous frame, the caller redraws all moving objects and
+    reports their rectangles to ``add()``, and ``present()`` updates only
+    the old and new rectangles on the display.  When a frame touches many
+    rectangles a single full flip is cheaper, so it falls back to that.
+    """
+
+    def __init__(self, screen, background, max_rects=64):
+        self.screen = screen
+        self.background = background
+        self.max_rects = max_rects
+        self.previous = []
+        self.rects = []
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Redraw and push the whole screen on the next frame."""
+        self.full_redraw = True
+
+    def begin(self):
+        if self.full_redraw or len(self.previous) > self.max_rects:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.previous:
+                self.screen.blit(self.background, rect, rect)
+        self.rects = []
+
+    def add(self, rect):
+        if rect is not None:
+            self.rects.append(rect)
+        return rect
+
+    def present(self):
+        dirty = self.previous + self.rects
+        if self.full_redraw or len(dirty) > self.max_rects:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+        self.previous = self.rects
+        self.full_redraw = False
+
+
+class PipeSurfaceCache:
+    """Pipe bodies rendered once per gap geometry and blitted at ``pipe.x``.
+
+    ``render(surface, x, gap_y, gap_size)`` draws a full-height pipe with its
+    left edge at integer ``x``.  Rendered pipes are kept in a bounded LRU
+    cache keyed by ``(gap_y, gap_size)``.  Blitting at ``int(x)`` gives the
+    same pixels as drawing at a float ``x``, since pygame truncates too.
+    """
+    MARGIN = 5  # Room for caps and stripe lines that overhang the pipe
+    COLORKEY = (255, 0, 255)
+
+    def __init__(self, render, width, max_entries=32):
+        self.render = render
+        self.width = width
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+    def draw(self, screen, x, gap_y, gap_size):
+        """Blit the pipe and return the rectangle of the screen drawn on."""
+        left = int(x)
+        if left < 0:
+            # pygame skips lines that start left of the screen, which a
+            # blit cannot reproduce: draw pipes crossing the edge directly
+            self.render(screen, left, gap_y, gap_size)
+            rect = pygame.Rect(left - self.MARGIN, 0, self.width + 2 * self.MARGIN, SCREEN_HEIGHT)
+            return rect.clip(screen.get_rect())
+
+        key = (gap_y, gap_size)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self._render(gap_y, gap_size)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return screen.blit(surface, (left - self.MARGIN, 0))
+
+    def _render(self, gap_y, gap_size):
+        surface = pygame.Surface((self.width + 2 * self.MARGIN, SCREEN_HEIGHT))
+        surface.fill(self.COLORKEY)
+        self.render(surface, self.MARGIN, gap_y, gap_size)
+        surface.set_colorkey(self.COLORKEY, pygame.RLEACCEL)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+
+class TextCache:
+    """Fonts and rendered strings, kept between frames.
+
+    Fonts are loaded once per ``(name, size)``.  Rendered strings live in a
+    bounded LRU cache, so HUD text is only rendered again when its value
+    changes.  Returned surfaces are shared: callers may set their alpha
+    right before blitting but must not draw on them.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+
+    def font(self, size, name=None):
+        font = self.fonts.get((name, size))
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(name, size)
+            self.fonts[(name, size)] = font
+        return font
+
+    def render(self, text, color, size=36, name=None, box=None):
+        """Return ``text`` rendered antialiased in ``color``.
+
+        With ``box=(width, height)`` the text is drawn at the top-left of a
+        transparent surface of that size, ready for per-surface alpha.
+        """
+        key = (text, color, size, name, box)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.font(size, name).render(text, True, color)
+            if box is not None:
+                boxed = pygame.Surface(box, pygame.SRCALPHA)
+                boxed.fill((255, 255, 255, 0))
+                boxed.blit(surface, (0, 0))
+                surface = boxed
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+
+# Shared by the HUD and score popups
+text_cache = TextCache()
@@ -0,0 +1,353 @@
+"""Record training runs and replay them without the networks.
+
+A bird's run is fully determined by its pipe course and by whether it
+flapped on each frame, so a run is stored as the course seed plus one bit
+per frame.  During training a ``FlapRecorder`` collects the decisions of
+the whole population (one row write per frame) and ``ReplayWriter``
+appends one record per genome to the log at the end of the generation.
+
+``ReplayLog`` memory-maps a log and indexes its records; ``Replay``
+re-simulates a run with the pygame-free ``VectorEnv`` and keeps the state
+of every frame, so a viewer can seek anywhere, play at any speed or in
+reverse and render frames offline.  Neither needs neat.
+
+File layout (little-endian):
+
+    header   4s magic b"FBRL", H version
+    records  4s magic b"RUN0", I generation, q genome key, Q course seed,
+             I frames, d fitness, I bytes, then the flap bits packed
+             eight frames per byte (numpy.packbits order)
+
+Records are only ever appended; a record cut short by a crash is ignored.
+
+Usage:
+    python replay.py LOG                      list the recorded runs
+    python replay.py LOG RUN                  watch run RUN (negative counts from the end)
+    python replay.py LOG --best               watch the best run (of --generation)
+    python replay.py LOG RUN --export DIR     write the frames as PNG images
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from vector_env import PIPE_SLOTS, FrameRenderer, VectorEnv, screen_pipes
+
+MAGIC = b"FBRL"
+RECORD_MAGIC = b"RUN0"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sH")
+_RECORD = struct.Struct("<4sIqQIdI")
+
+Run = namedtuple("Run", "index generation genome seed frames fitness offset nbytes")
+
+
+class FlapRecorder:
+    """Flap decisions of a population, collected frame by frame.
+
+    ``PopulationSim`` calls ``record(rows, flapping)`` once per frame with
+    the birds alive at the start of the frame and those that flapped.
+    Every block of eight frames shares one byte per bird, in the bit order
+    of ``numpy.packbits``, so a bird's run is a column of the byte matrix.
+    """
+
+    def __init__(self, size, capacity=1024):
+        self.size = size
+        self.bits = np.zeros(((capacity + 7) // 8, size), dtype=np.uint8)
+        self.frame = 0
+        # Frames each bird was alive for; -1 while it still is
+        self.frames = np.full(size, -1, dtype=np.int64)
+        self._rows = np.arange(size)
+
+    def record(self, rows, flapping):
+        block = self.frame >> 3
+        if block == len(self.bits):
+            self.bits = np.concatenate([self.bits, np.zeros_like(self.bits)])
+        self.bits[block, flapping] |= np.uint8(0x80 >> (self.frame & 7))
+        if len(rows) != len(self._rows):
+            # Birds only ever die, so this runs on the few frames with deaths
+            dead = np.setdiff1d(self._rows, rows, assume_unique=True)
+            self.frames[dead] = self.frame
+            self._rows = rows
+        self.frame += 1
+
+    def flaps(self, index):
+        """Flap bits of bird ``index``, one per frame it was alive."""
+        frames = self.frames[index]
+        if frames < 0:
+            frames = self.frame
+        return np.unpackbits(self.bits[:(frames + 7) // 8, index], count=frames).astype(bool)
+
+
+class ReplayWriter:
+    """Appends recorded runs to a replay log."""
+
+    def __init__(self, path):
+        self.path = path
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                _check_header(f.read(_HEADER.size), path)
+            self.file = open(path, "ab")
+        else:
+            self.file = open(path, "ab")
+            self.file.write(_HEADER.pack(MAGIC, VERSION))
+
+    def write(self, generation, genome, seed, flaps, fitness):
+        """Append one run: ``flaps`` holds one truthy value per frame."""
+        self.file.write(_pack_run(generation, genome, seed, flaps, fitness))
+
+    def write_population(self, generation, genomes, seed, recorder, fitness):
+        """Append the runs of a recorded population, in population order."""
+        records = [_pack_run(generation, genome, seed, recorder.flaps(i), fit)
+                   for i, (genome, fit) in enumerate(zip(genomes, fitness))]
+        self.file.write(b"".join(records))
+        # A viewer may open the log while training goes on
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def _pack_run(generation, genome, seed, flaps, fitness):
+    flaps = np.asarray(flaps, dtype=bool)
+    bits = np.packbits(flaps).tobytes()
+    return _RECORD.pack(RECORD_MAGIC, generation, genome, seed, len(flaps),
+                        fitness, len(bits)) + bits
+
+
+def _check_header(data, path):
+    if len(data) < _HEADER.size or data[:4] != MAGIC:
+        raise ValueError("{0} is not a replay log".format(path))
+    version = _HEADER.unpack(data)[1]
+    if version > VERSION:
+        raise ValueError("{0} has format version {1}, this reader reads up to {2}".format(
+            path, version, VERSION))
+
+
+class ReplayLog:
+    """Read-only, memory-mapped view of a replay log."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _check_header(self.data[:_HEADER.size], path)
+        self.runs = self._index()
+
+    def _index(self):
+        runs = []
+        offset = _HEADER.size
+        size = len(self.data)
+        while offset + _RECORD.size <= size:
+            magic, generation, genome, seed, frames, fitness, nbytes = _RECORD.unpack_from(self.data, offset)
+            if magic != RECORD_MAGIC or offset + _RECORD.size + nbytes > size:
+                # Torn write at the end of the log
+                break
+            runs.append(Run(len(runs), generation, genome, seed, frames, fitness,
+                            offset + _RECORD.size, nbytes))
+            offset += _RECORD.size + nbytes
+        return runs
+
+    def __len__(self):
+        return len(self.runs)
+
+    def __getitem__(self, index):
+        return self.runs[index]
+
+    def flaps(self, run):
+        """Unpack the flap bits of ``run`` from the mapped file."""
+        packed = np.frombuffer(self.data, dtype=np.uint8, count=run.nbytes, offset=run.offset)
+        return np.unpackbits(packed, count=run.frames).astype(bool)
+
+    def best(self, generation=None):
+        """The run with the highest fitness, optionally within one generation."""
+        runs = [run for run in self.runs if generation is None or run.generation == generation]
+        if not runs:
+            return None
+        return max(runs, key=lambda run: run.fitness)
+
+    def replay(self, run):
+        return Replay(run.seed, self.flaps(run), label=run.generation)
+
+    def close(self):
+        self.data.close()
+
+
+class Replay:
+    """Every frame of a recorded run, re-simulated from its seed and flaps.
+
+    Frame k holds what training drew after its (k + 1)-th step: the bird
+    after gravity, the pipes after moving and the score.
+    """
+
+    def __init__(self, seed, flaps, label=""):
+        self.seed = seed
+        self.label = label
+        frames = len(flaps)
+        self.y = np.empty(frames, dtype=np.float64)
+        self.wing_angle = np.empty(frames, dtype=np.float64)
+        self.alive = np.empty(frames, dtype=bool)
+        self.score = np.empty(frames, dtype=np.int64)
+        self.first = np.empty(frames, dtype=np.int64)
+        self.count = np.empty(frames, dtype=np.int64)
+        self.pipe_x = np.empty((frames, PIPE_SLOTS), dtype=np.float64)
+
+        env = VectorEnv(1)
+        env.reset([seed])
+        self.course = env.courses[seed]
+        action = np.zeros(1, dtype=bool)
+        for k, flap in enumerate(np.asarray(flaps, dtype=bool).tolist()):
+            # The bird moves at the start of a frame, the pipes during the step
+            self.y[k] = env.y[0]
+            self.wing_angle[k] = env.wing_angle
+            action[0] = flap
+            env.step(action)
+            # Ground deaths of the next frame are already in env.alive
+            self.alive[k] = env.started[0]
+            self.score[k] = env.score[0]
+            self.first[k] = env.first[0]
+            self.count[k] = env.count[0]
+            self.pipe_x[k] = env.pipe_x[0]
+
+    def __len__(self):
+        return len(self.y)
+
+    def pipes(self, k):
+        """``(x, gap_y, gap_size)`` of the pipes on screen in frame ``k``."""
+        return screen_pipes(self.course, int(self.first[k]), int(self.count[k]), self.pipe_x[k])
+
+
+class ReplayViewer:
+    """Draws a replay with the training game's renderer."""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.renderer = FrameRenderer()
+        self.pygame = self.renderer.pygame
+        self.game = self.renderer.game
+
+    def draw(self, k):
+        replay = self.replay
+        self.renderer.draw(replay.pipes(k), replay.score[k], replay.y[k], replay.wing_angle[k],
+                           replay.alive[k], replay.label)
+
+    def play(self, speed=1.0, start=0, fps=60):
+        """Play in a window; ``speed`` is in frames per displayed frame and may be negative.
+
+        Space pauses, left/right seek a second, up/down change the speed,
+        R reverses, Home/End jump to either end and Escape quits.
+        """
+        pygame = self.pygame
+        last = len(self.replay) - 1
+        position = float(min(max(start, 0), last))
+        paused = False
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return
+                if event.type != pygame.KEYDOWN:
+                    continue
+                if event.key == pygame.K_ESCAPE:
+                    return
+                elif event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_LEFT:
+                    position -= fps
+                elif event.key == pygame.K_RIGHT:
+                    position += fps
+                elif event.key == pygame.K_UP:
+                    speed *= 2
+                elif event.key == pygame.K_DOWN:
+                    speed /= 2
+                elif event.key == pygame.K_r:
+                    speed = -speed
+                elif event.key == pygame.K_HOME:
+                    position = 0
+                elif event.key == pygame.K_END:
+                    position = last
+            position = min(max(position, 0), last)
+
+            k = int(position)
+            self.draw(k)
+            pygame.display.set_caption(f"Flapping Bird replay - frame {k + 1}/{last + 1}, "
+                                       f"speed {speed:g}{' (paused)' if paused else ''}")
+            self.game.clock.tick(fps)
+            if not paused:
+                position += speed
+
+    def export(self, directory, start=0, stop=None, every=1):
+        """Write frames ``start, start + every, ...`` before ``stop`` as PNG files."""
+        os.makedirs(directory, exist_ok=True)
+        frames = range(start, len(self.replay) if stop is None else min(stop, len(self.replay)), every)
+        for k in frames:
+            self.draw(k)
+            self.pygame.image.save(self.game.screen, os.path.join(directory, f"frame_{k:06d}.png"))
+        return len(frames)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay runs recorded with flappy_bird_ai.py --record")
+    parser.add_argument("log", help="replay log to read")
+    parser.add_argument("run", nargs="?", type=int, default=None,
+                        help="index of the run to replay (negative counts from the end); "
+                             "without it the runs are listed")
+    parser.add_argument("--best", action="store_true",
+                        help="replay the run with the highest fitness")
+    parser.add_argument("--generation", type=int, default=None,
+                        help="only list or pick runs of this generation")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="frames advanced per displayed frame; negative plays in reverse")
+    parser.add_argument("--start", type=int, default=0,
+                        help="frame to start at")
+    parser.add_argument("--export", metavar="DIR", default=None,
+                        help="render frames headless into DIR as PNG images instead of playing")
+    parser.add_argument("--stop", type=int, default=None,
+                        help="last frame (exclusive) to export")
+    parser.add_argument("--every", type=int, default=1,
+                        help="export every Nth frame")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    log = ReplayLog(args.log)
+    if args.best:
+        run = log.best(args.generation)
+    elif args.run is not None:
+        if not log.runs:
+            run = None
+        elif -len(log) <= args.run < len(log):
+            run = log[args.run]
+        else:
+            print(f"No run {args.run}; the log has runs 0 to {len(log) - 1} "
+                  f"(or -{len(log)} to -1 from the end).")
+            return 1
+    else:
+        for run in log.runs:
+            if args.generation is None or run.generation == args.generation:
+                print(f"{run.index:6d}  generation {run.generation:4d}  genome {run.genome:6d}  "
+                      f"seed {run.seed:10d}  frames {run.frames:7d}  fitness {run.fitness:10.1f}")
+        return 0
+    if run is None:
+        print("No recorded runs.")
+        return 1
+
+    if args.export:
+        # Offline rendering needs no display
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    viewer = ReplayViewer(log.replay(run))
+    if args.export:
+        count = viewer.export(args.export, args.start, args.stop, args.every)
+        print(f"Wrote {count} frames to {args.export}")
+    else:
+        viewer.play(args.speed, args.start)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Live view of training, drawn while the simulation runs on a worker thread.
+
+SDL wants its window and event pump on the main thread (macOS insists on
+it), so ``SpectatorView.run`` moves training onto a worker thread and draws
+on the thread that called it.  The training loop hands
+``SpectatorView.publish`` the simulator after each frame.  At most ``fps``
+times a second it copies a compact ``Snapshot`` (the pipes, the score and
+the y positions of the top-K live birds) into a small bounded queue and
+returns; it never waits.  The view draws the newest snapshot; when it falls
+behind, older snapshots are dropped instead of holding up the simulation.
+"""
+import queue
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from lazy_import import lazy_import
+from physics import BIRD_X
+
+pygame = lazy_import("pygame")
+
+Snapshot = namedtuple("Snapshot", "generation frame score alive pipes ys wing_angle")
+
+
+class SpectatorView:
+    def __init__(self, game_type, bird_type, top_k=None, fps=30, max_queue=2):
+        """
+        Show the ``top_k`` best live birds (all when None) at ``fps`` frames
+        per second, drawn by a windowed ``game_type`` with ``bird_type``
+        birds (the training game's ``Game`` and ``Bird``).
+        """
+        self.game_type = game_type
+        self.bird_type = bird_type
+        self.top_k = top_k
+        self.fps = fps
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.interval = 1.0 / fps
+        self.last_publish = 0.0
+        self.dropped = 0
+        # Set once the window is closed; training carries on without a view
+        self.closed = threading.Event()
+
+    def run(self, train):
+        """Call ``train()`` on a worker thread and draw until it returns; returns its result."""
+        finished = threading.Event()
+        outcome = {}
+
+        def work():
+            try:
+                outcome["result"] = train()
+            except BaseException as error:
+                outcome["error"] = error
+            finally:
+                finished.set()
+
+        worker = threading.Thread(target=work, name="training", daemon=True)
+        worker.start()
+        try:
+            self._draw(finished)
+            # The window may be closed early; keep waiting in steps so Ctrl+C still lands
+            while not finished.wait(0.1):
+                pass
+        finally:
+            self.closed.set()
+        worker.join()
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    def publish(self, sim, generation):
+        """Queue a snapshot of the simulator if one is due; never blocks."""
+        if self.closed.is_set():
+            return
+        now = time.perf_counter()
+        if now - self.last_publish < self.interval:
+            return
+        self.last_publish = now
+
+        rows = np.flatnonzero(sim.alive)
+        if self.top_k is not None and len(rows) > self.top_k:
+            # Live birds share the same fitness; rank them by shaping reward
+            best = np.argpartition(sim.shaping[rows], -self.top_k)[-self.top_k:]
+            rows = rows[best]
+        game = sim.game
+        snapshot = Snapshot(generation, game.frame_iteration, game.score, sim.num_alive(),
+                            tuple((pipe.x, pipe.gap_y, pipe.gap_size) for pipe in game.pipes),
+                            sim.y[rows].copy(), sim.wing_angle)
+        try:
+            self.queue.put_nowait(snapshot)
+        except queue.Full:
+            # Falling behind: replace the oldest snapshot with this one
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(snapshot)
+            except queue.Full:
+                self.dropped += 1
+
+    def _draw(self, finished):
+        """Draw snapshots until training finishes or the window is closed."""
+        viewer = self.game_type(verbose=False)
+        pygame.display.set_caption("Flapping Bird AI - spectator")
+        birds = []
+
+        while not finished.is_set() and not self.closed.is_set():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.closed.set()
+            try:
+                snapshot = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            viewer.set_pipes(snapshot.pipes)
+            viewer.score = snapshot.score
+            while len(birds) < len(snapshot.ys):
+                birds.append(self.bird_type(BIRD_X, 0))
+            shown = birds[:len(snapshot.ys)]
+            for bird, y in zip(shown, snapshot.ys.tolist()):
+                bird.y = y
+                bird.wing_angle = snapshot.wing_angle
+            viewer.draw(shown, snapshot.generation, alive=snapshot.alive)
+            viewer.clock.tick(self.fps)
+
+        pygame.display.quit()
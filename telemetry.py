@@ -0,0 +1,130 @@
+"""Training metrics served over HTTP in the Prometheus text format.
+
+``TelemetryReporter`` is a NEAT reporter: after each generation's
+evaluation it takes a small snapshot of the numbers below and swaps it in
+for the previous one.  A ``ThreadingHTTPServer`` on a daemon thread turns
+the current snapshot into text whenever ``/metrics`` is scraped, so the
+training loop never waits on a client; it only pays for the probe's
+timers and one dict per generation.
+
+    curl http://127.0.0.1:9100/metrics
+"""
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import neat
+from neat.math_util import mean, stdev
+
+# name, help text; all are gauges
+METRICS = (
+    ("flappy_generation", "Generation that was evaluated last."),
+    ("flappy_fitness_best", "Best fitness of the last generation."),
+    ("flappy_fitness_mean", "Mean fitness of the last generation."),
+    ("flappy_fitness_stdev", "Standard deviation of the last generation's fitness."),
+    ("flappy_species", "Number of species."),
+    ("flappy_frames_per_second", "Simulated frames per second during the last evaluation."),
+    ("flappy_activations_per_second", "Network activations per second during the last evaluation."),
+    ("flappy_evaluation_seconds", "Wall-clock time of the last generation's evaluation."),
+    ("flappy_generation_seconds", "Wall-clock time of the last complete generation, reproduction included."),
+    ("flappy_checkpoint_age_seconds", "Seconds since the last population checkpoint was saved."),
+)
+
+
+def _format(value):
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+class TelemetryReporter(neat.reporting.BaseReporter):
+    def __init__(self, port, probe=None, checkpointer=None, host="127.0.0.1"):
+        """
+        Serve metrics on ``host:port``.  Frame and activation rates need a
+        ``Probe`` fed by the simulation; the checkpoint age needs the
+        ``PopulationCheckpointer``.  Metrics without data are left out.
+        """
+        self.probe = probe
+        self.checkpointer = checkpointer
+        self.metrics = {}
+        self.generation = None
+        self.started = None
+
+        reporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = reporter.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="telemetry", daemon=True)
+        self.thread.start()
+
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    def start_generation(self, generation):
+        self.generation = generation
+        self.started = time.perf_counter()
+        if self.probe is not None:
+            self.probe.reset()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        seconds = time.perf_counter() - self.started
+        fitnesses = [genome.fitness for genome in population.values()]
+        metrics = dict(self.metrics)
+        metrics.update({
+            "flappy_generation": self.generation,
+            "flappy_fitness_best": best_genome.fitness,
+            "flappy_fitness_mean": mean(fitnesses),
+            "flappy_fitness_stdev": stdev(fitnesses),
+            "flappy_species": len(species.species),
+            "flappy_evaluation_seconds": seconds,
+        })
+        counters = self.probe.counters if self.probe is not None else {}
+        if counters.get("frames") and seconds > 0:
+            metrics["flappy_frames_per_second"] = counters["frames"] / seconds
+            metrics["flappy_activations_per_second"] = counters.get("activations", 0) / seconds
+        # Swapping the dict is atomic, so the server thread never sees half an update
+        self.metrics = metrics
+
+    def end_generation(self, config, population, species_set):
+        metrics = dict(self.metrics)
+        metrics["flappy_generation_seconds"] = time.perf_counter() - self.started
+        self.metrics = metrics
+
+    def render(self):
+        """The current metrics in the Prometheus text exposition format."""
+        metrics = dict(self.metrics)
+        saved = getattr(self.checkpointer, "last_saved", None)
+        if saved is not None:
+            metrics["flappy_checkpoint_age_seconds"] = time.time() - saved
+        lines = []
+        for name, help_text in METRICS:
+            if metrics.get(name) is None:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_format(metrics[name])}")
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
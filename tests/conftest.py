@@ -0,0 +1,67 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Headless runs still create pygame surfaces
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+
+@pytest.fixture(scope="session")
+def config():
+    import neat
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                       neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                       os.path.join(ROOT, "config-feedforward.txt"))
+
+
+@pytest.fixture(scope="session")
+def make_genomes(config):
+    """Seeded random genomes with topologies varied by up to ``mutations`` mutations."""
+    import random
+
+    def make(size, mutations=20, seed=0):
+        rng_state = random.getstate()
+        random.seed(seed)
+        genomes = []
+        for key in range(size):
+            genome = config.genome_type(key)
+            genome.configure_new(config.genome_config)
+            for _ in range(random.randint(0, mutations)):
+                genome.mutate(config.genome_config)
+            genomes.append(genome)
+        random.setstate(rng_state)
+        return genomes
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def best_mutants(config):
+    """Copies of the trained best_genome.pkl, keyed from 1000; all but the first mutated once.
+
+    They fly long enough to pass pipes and raise the difficulty.
+    """
+    import copy
+    import pickle
+    import random
+
+    with open(os.path.join(ROOT, "best_genome.pkl"), "rb") as f:
+        best = pickle.load(f)
+
+    def make(size, seed=0):
+        rng_state = random.getstate()
+        random.seed(seed)
+        genomes = []
+        for i in range(size):
+            genome = copy.deepcopy(best)
+            genome.key = 1000 + i
+            if i:
+                genome.mutate(config.genome_config)
+            genomes.append(genome)
+        random.setstate(rng_state)
+        return genomes
+
+    return make
@@ -0,0 +1,52 @@
+import neat
+import numpy as np
+
+from batched_net import BatchedNetwork
+
+# numpy's exp and tanh may round the last bit differently from the math
+# module, so outputs agree to within a few units in the last place
+TOLERANCE = 4 * np.finfo(np.float64).eps
+
+
+def feed_forward(genomes, config, inputs):
+    return np.array([neat.nn.FeedForwardNetwork.create(genome, config).activate(row)[0]
+                     for genome, row in zip(genomes, inputs.tolist())])
+
+
+def make_inputs(size, seed):
+    rng = np.random.default_rng(seed)
+    y = rng.uniform(0, 575, size)
+    return np.column_stack([y, np.abs(y - rng.uniform(200, 400, size)), rng.uniform(0, 300, size)])
+
+
+def test_matches_feed_forward(config, make_genomes):
+    genomes = make_genomes(500, mutations=20, seed=1)
+    inputs = make_inputs(len(genomes), seed=1)
+    expected = feed_forward(genomes, config, inputs)
+    outputs = BatchedNetwork(genomes, config).activate(inputs)[:, 0]
+    assert np.abs(outputs - expected).max() <= TOLERANCE
+    assert np.array_equal(outputs > 0.5, expected > 0.5)
+
+
+def test_live_rows_match_feed_forward(config, make_genomes):
+    genomes = make_genomes(200, mutations=40, seed=2)
+    inputs = make_inputs(len(genomes), seed=2)
+    nets = BatchedNetwork(genomes, config)
+    rows = np.arange(len(genomes))
+    # Birds only ever die, so the live rows shrink frame by frame
+    while len(rows):
+        expected = feed_forward([genomes[r] for r in rows], config, inputs[rows])
+        outputs = nets.activate(inputs[rows], rows)[:, 0]
+        assert np.abs(outputs - expected).max() <= TOLERANCE
+        rows = rows[1::2] if len(rows) > 1 else rows[:0]
+
+
+def test_rows_in_any_order(config, make_genomes):
+    genomes = make_genomes(6, mutations=20, seed=3)
+    inputs = make_inputs(len(genomes), seed=3)
+    nets = BatchedNetwork(genomes, config)
+    # A full permutation, a subset and a reordered subset of the sliced tables
+    for rows in ([5, 0, 3, 1, 4, 2], [4, 1, 2], [2, 4], [1, 2, 4]):
+        expected = feed_forward([genomes[r] for r in rows], config, inputs[rows])
+        outputs = nets.activate(inputs[rows], rows)[:, 0]
+        assert np.abs(outputs - expected).max() <= TOLERANCE
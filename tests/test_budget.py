@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from vector_sim import GenerationBudget, PopulationSim
+
+
+def make_sim(fitness, alive, frames):
+    sim = PopulationSim(len(fitness), SimpleNamespace(frame_iteration=frames))
+    sim.fitness[:] = fitness
+    sim.alive[:] = alive
+    return sim
+
+
+def test_ranking_stop_keeps_fitness():
+    sim = make_sim([14.6, 9.0, 3.1], [True, False, False], 146)
+    budget = GenerationBudget(max_frames=30000, stop_when_ranked=True, projection_ceiling=1000)
+    budget.start()
+    assert budget.exhausted(sim)
+    assert budget.reason == "ranking"
+    budget.normalize(sim)
+    assert sim.fitness.tolist() == [14.6, 9.0, 3.1]
+
+
+def test_time_stop_projects_survivors():
+    sim = make_sim([10.0, 4.0], [True, False], 100)
+    budget = GenerationBudget(max_frames=400, max_seconds=0)
+    budget.start()
+    assert budget.exhausted(sim)
+    assert budget.reason == "time"
+    budget.normalize(sim)
+    assert sim.fitness.tolist() == [40.0, 4.0]
+
+
+def test_projection_stays_below_threshold():
+    sim = make_sim([14.6, 1200.0, 5.0], [True, True, False], 146)
+    budget = GenerationBudget(max_frames=30000, max_seconds=0, projection_ceiling=1000)
+    budget.start()
+    budget.exhausted(sim)
+    budget.normalize(sim)
+    assert sim.fitness[0] < 1000
+    assert sim.fitness[0] == np.nextafter(1000, 0)
+    # Fitness that was earned in play is never lowered
+    assert sim.fitness[1] == 1200.0
+    assert sim.fitness[2] == 5.0
+
+
+def test_clock_limit_needs_horizon():
+    with pytest.raises(ValueError):
+        GenerationBudget(max_seconds=10)
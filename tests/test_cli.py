@@ -0,0 +1,45 @@
+import pytest
+
+from flappy_bird_ai import parse_args
+
+
+@pytest.mark.parametrize("argv", [
+    ["--courses", "4", "--max-seconds", "10"],
+    ["--courses", "4", "--early-stop"],
+    ["--islands", "2", "--max-seconds", "10"],
+    ["--islands", "2", "--early-stop"],
+    ["--workers", "2", "--max-seconds", "10"],
+    ["--workers", "2", "--early-stop"],
+])
+def test_parallel_runs_reject_clock_and_early_stops(argv):
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+
+
+def test_batched_runs_take_frame_limits():
+    args = parse_args(["--courses", "4", "--islands", "2", "--max-frames", "3000"])
+    assert args.max_frames == 3000
+
+
+def test_clock_limit_needs_frame_limit():
+    with pytest.raises(SystemExit):
+        parse_args(["--max-seconds", "60"])
+    assert parse_args(["--max-seconds", "60", "--max-frames", "20000"]).max_seconds == 60
+
+
+@pytest.mark.parametrize("argv", [
+    ["--workers", "2", "--spectate"],
+    ["--courses", "4", "--spectate"],
+    ["--islands", "2", "--spectate"],
+    ["--islands", "2", "--workers", "2"],
+    ["--islands", "2", "--checkpoint-every", "10"],
+    ["--islands", "2", "--checkpoint-seconds", "0"],
+    ["--islands", "2", "--profile", "profile.jsonl"],
+])
+def test_flags_a_run_would_ignore_are_rejected(argv):
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+
+
+def test_spectator_watches_single_process_training():
+    assert parse_args(["--spectate", "--max-frames", "3000"]).spectate
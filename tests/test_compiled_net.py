@@ -0,0 +1,17 @@
+import random
+
+import neat
+
+from compiled_net import export_network, load_network
+
+
+def test_bit_exact_on_mutated_genomes(config, make_genomes, tmp_path):
+    rng = random.Random(5)
+    for genome in make_genomes(400, mutations=60, seed=4):
+        path = str(tmp_path / f"{genome.key}.net")
+        export_network(genome, config, path)
+        expected = neat.nn.FeedForwardNetwork.create(genome, config)
+        compiled = load_network(path)
+        for _ in range(5):
+            inputs = [rng.uniform(0, 575), rng.uniform(0, 300), rng.uniform(0, 400)]
+            assert compiled.activate(inputs) == expected.activate(inputs)
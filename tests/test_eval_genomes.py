@@ -0,0 +1,134 @@
+"""eval_genomes against the per-bird training loop it replaced.
+
+``baseline_eval`` is the original loop with the drawing taken out: one
+``Bird`` object and one FeedForwardNetwork per genome, pygame rectangles
+for collisions and the shared +5 pipe reward.  Fitness must match it bit
+for bit.
+"""
+import math
+import random
+
+import neat
+import pygame
+
+import flappy_bird_ai
+from vector_sim import GenerationBudget
+
+SCREEN_WIDTH = 400
+SCREEN_HEIGHT = 600
+GRAVITY = 0.25
+FLAP_STRENGTH = -7
+INITIAL_PIPE_SPEED = 3
+
+
+class Bird:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.velocity = 0
+        self.size = 25
+        self.wing_angle = 0
+        self.alive = True
+
+    def update(self):
+        self.velocity += GRAVITY
+        self.y += self.velocity
+        self.wing_angle += 0.2
+        if self.wing_angle > 2 * math.pi:
+            self.wing_angle = 0
+        if self.y < 0:
+            self.y = 0
+            self.velocity = 0
+        elif self.y > SCREEN_HEIGHT - self.size:
+            self.y = SCREEN_HEIGHT - self.size
+            self.velocity = 0
+            self.alive = False
+
+
+class Pipe:
+    def __init__(self, difficulty_level=0):
+        self.gap_y = random.randint(200, SCREEN_HEIGHT - 200)
+        self.x = SCREEN_WIDTH
+        self.width = 50
+        self.gap_size = max(150, 200 - (difficulty_level * 5))
+        self.speed = INITIAL_PIPE_SPEED + (difficulty_level * 0.25)
+        self.passed = False
+
+    def collides_with(self, bird):
+        bird_rect = pygame.Rect(bird.x - bird.size, bird.y, bird.size, bird.size)
+        top_pipe = pygame.Rect(self.x, 0, self.width, self.gap_y - self.gap_size // 2)
+        bottom_pipe = pygame.Rect(self.x, self.gap_y + self.gap_size // 2,
+                                  self.width, SCREEN_HEIGHT - (self.gap_y + self.gap_size // 2))
+        return bird_rect.colliderect(top_pipe) or bird_rect.colliderect(bottom_pipe)
+
+
+def baseline_eval(genomes, config, max_frames):
+    nets = [neat.nn.FeedForwardNetwork.create(genome, config) for _, genome in genomes]
+    birds = [Bird(SCREEN_WIDTH // 3, SCREEN_HEIGHT // 2) for _ in genomes]
+    ge = [genome for _, genome in genomes]
+    for genome in ge:
+        genome.fitness = 0
+    pipes = [Pipe(0)]
+    score = 0
+    difficulty_level = 0
+    frame = 0
+    while any(bird.alive for bird in birds) and frame < max_frames:
+        frame += 1
+        pipe_idx = 1 if len(pipes) > 1 and pipes[0].x < birds[0].x else 0
+        for x, bird in enumerate(birds):
+            if bird.alive:
+                bird.update()
+                ge[x].fitness += 0.1
+                output = nets[x].activate((bird.y, abs(bird.y - pipes[pipe_idx].gap_y),
+                                           abs(bird.x - pipes[pipe_idx].x)))
+                if output[0] > 0.5:
+                    bird.velocity = FLAP_STRENGTH
+        rem = []
+        add_pipe = False
+        for pipe in pipes:
+            pipe.x -= pipe.speed
+            for bird in birds:
+                if bird.alive and pipe.collides_with(bird):
+                    bird.alive = False
+                if bird.alive and not pipe.passed and pipe.x < bird.x:
+                    pipe.passed = True
+                    add_pipe = True
+            if pipe.x + pipe.width < 0:
+                rem.append(pipe)
+        if add_pipe:
+            score += 1
+            if score % 15 == 0 and difficulty_level < 5:
+                difficulty_level += 1
+            for genome in ge:
+                genome.fitness += 5
+            pipes.append(Pipe(difficulty_level))
+        for pipe in rem:
+            pipes.remove(pipe)
+
+
+def test_fitness_matches_baseline(config, make_genomes, best_mutants, monkeypatch, tmp_path):
+    # A generation that reaches score 100 saves a checkpoint file
+    monkeypatch.chdir(tmp_path)
+    genomes = list(enumerate(make_genomes(60, mutations=20, seed=3)))
+    genomes += [(genome.key, genome) for genome in best_mutants(40, seed=4)]
+
+    for seed in range(3):
+        random.seed(seed)
+        baseline_eval(genomes, config, max_frames=3000)
+        expected = [genome.fitness for _, genome in genomes]
+        random.seed(seed)
+        flappy_bird_ai.eval_genomes(genomes, config, headless=True, budget=GenerationBudget(max_frames=3000))
+        assert [genome.fitness for _, genome in genomes] == expected
+    assert max(expected) > 5 * 15
+
+
+def test_seed_fixes_the_course(config, best_mutants, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    genomes = [(genome.key, genome) for genome in best_mutants(20, seed=4)]
+    runs = []
+    for state in range(2):
+        random.seed(state)
+        flappy_bird_ai.eval_genomes(genomes, config, headless=True, budget=GenerationBudget(max_frames=2000),
+                                    seed=5)
+        runs.append([genome.fitness for _, genome in genomes])
+    assert runs[0] == runs[1]
@@ -0,0 +1,49 @@
+import copy
+import itertools
+import random
+
+import neat
+
+from islands import _settle, node_id_base
+
+
+def island_population(config, index):
+    # Every island numbers its nodes from its own config
+    config = copy.deepcopy(config)
+    genome_config = config.genome_config
+    genome_config.node_indexer = itertools.count(node_id_base(index, genome_config))
+    return neat.Population(config)
+
+
+def test_immigrant_node_ids_do_not_collide(config):
+    random.seed(0)
+    home, away = island_population(config, 0), island_population(config, 1)
+    size = len(home.population)
+    # Genomes the home island already scored stay; only fresh offspring make room
+    evaluated = set(list(home.population)[:size // 2])
+    immigrants = list(away.population.values())[:5]
+    for genome in immigrants:
+        genome.fitness = 1.0
+        for _ in range(3):
+            genome.mutate_add_node(away.config.genome_config)
+    away_ids = {node for genome in immigrants for node in genome.nodes}
+    _settle(home, immigrants, evaluated)
+
+    assert len(home.population) == size
+    assert evaluated <= set(home.population)
+    for genome in immigrants:
+        # Re-keyed on arrival and scored again on the home island
+        assert home.population[genome.key] is genome
+        assert genome.key > size
+        assert genome.fitness is None
+    home_ids = {node for genome in home.population.values() if genome not in immigrants
+                for node in genome.nodes}
+    assert home_ids & away_ids == set(range(home.config.genome_config.num_outputs))
+    # New nodes of settled immigrants come from the home island's range
+    for genome in immigrants:
+        before = set(genome.nodes)
+        for _ in range(3):
+            genome.mutate_add_node(home.config.genome_config)
+        added = set(genome.nodes) - before
+        assert added and all(node < node_id_base(1, home.config.genome_config) for node in added)
+        assert not added & away_ids
@@ -0,0 +1,54 @@
+import numpy as np
+
+import flappy_bird_ai
+from batched_net import BatchedNetwork
+from replay import FlapRecorder, Replay, ReplayLog, ReplayWriter, main
+from vector_sim import PopulationSim
+
+
+def play_recorded(config, genomes, seed, max_frames=2000):
+    size = len(genomes)
+    game = flappy_bird_ai.Game(headless=True, seed=seed, verbose=False)
+    recorder = FlapRecorder(size, capacity=16)
+    sim = PopulationSim(size, game, recorder=recorder)
+    nets = BatchedNetwork(genomes, config)
+    while sim.any_alive() and game.frame_iteration < max_frames:
+        sim.step(lambda inputs, rows: nets.activate(inputs, rows)[:, 0])
+    return sim, recorder
+
+
+def test_replay_matches_training(config, make_genomes):
+    seed = 11
+    sim, recorder = play_recorded(config, make_genomes(40, mutations=5, seed=seed), seed)
+    for i in range(sim.alive.size):
+        flaps = recorder.flaps(i)
+        replay = Replay(seed, flaps)
+        assert replay.y[-1] == sim.y[i]
+        # The bird is drawn up to and including the frame it dies in
+        assert replay.alive[:-1].all()
+        assert replay.alive[-1] == sim.alive[i]
+
+
+def test_log_round_trip(config, make_genomes, tmp_path):
+    sim, recorder = play_recorded(config, make_genomes(10, mutations=5, seed=5), 5)
+    path = str(tmp_path / "runs.log")
+    writer = ReplayWriter(path)
+    writer.write_population(0, list(range(10)), 5, recorder, sim.fitness.tolist())
+    writer.close()
+    log = ReplayLog(path)
+    assert len(log) == 10
+    for i, run in enumerate(log.runs):
+        assert np.array_equal(log.flaps(run), recorder.flaps(i))
+        assert run.fitness == sim.fitness[i]
+    log.close()
+
+
+def test_main_rejects_unknown_run(config, make_genomes, tmp_path, capsys):
+    sim, recorder = play_recorded(config, make_genomes(3, mutations=5, seed=2), 2)
+    path = str(tmp_path / "runs.log")
+    writer = ReplayWriter(path)
+    writer.write_population(0, [0, 1, 2], 2, recorder, sim.fitness.tolist())
+    writer.close()
+    assert main([path, "3"]) == 1
+    assert "0 to 2" in capsys.readouterr().out
+    assert main([path, "-4"]) == 1
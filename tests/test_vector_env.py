@@ -0,0 +1,45 @@
+import numpy as np
+
+import flappy_bird_ai
+from batched_net import BatchedNetwork
+from course import Course
+from vector_env import VectorEnv
+from vector_sim import GenerationBudget
+
+
+def population(make_genomes, best_mutants):
+    return make_genomes(60, mutations=30, seed=6) + best_mutants(20, seed=7)
+
+
+def play(env, nets, seeds, max_frames):
+    obs = env.reset(seeds)
+    fitness = np.zeros(env.num_envs)
+    done = np.zeros(env.num_envs, dtype=bool)
+    frames = 0
+    while not done.all() and frames < max_frames:
+        obs, rewards, done, _ = env.step(nets.activate(obs)[:, 0] > 0.5)
+        fitness += rewards
+        frames += 1
+    return fitness
+
+
+def test_matches_evaluate_course(config, make_genomes, best_mutants):
+    genomes = population(make_genomes, best_mutants)
+    budget = GenerationBudget(max_frames=3000)
+    for seed in (0, 5):
+        expected, _ = flappy_bird_ai.evaluate_course(genomes, config, Course(seed), budget=budget)
+        fitness = play(VectorEnv(len(genomes)), BatchedNetwork(genomes, config), [seed] * len(genomes), 3000)
+        assert fitness.tolist() == expected
+        # Some birds pass pipes
+        assert max(expected) > 5
+
+
+def test_courses_match_single_course_runs(config, make_genomes, best_mutants):
+    genomes = population(make_genomes, best_mutants)
+    budget = GenerationBudget(max_frames=3000)
+    seeds = [2, 3, 4]
+    per_course = np.column_stack([
+        flappy_bird_ai.evaluate_course(genomes, config, Course(seed), budget=budget)[0] for seed in seeds])
+    fitness, counters = flappy_bird_ai.evaluate_courses(genomes, config, seeds, aggregate="min", budget=budget)
+    assert fitness == per_course.min(axis=1).tolist()
+    assert counters["activations"] == counters["alive_bird_frames"]
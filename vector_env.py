@@ -0,0 +1,260 @@
+"""Batched, pygame-free Flapping Bird environment.
+
+``VectorEnv`` runs N independent games, each with its own bird and its own
+seeded pipe course, as NumPy arrays.  It follows the usual reset/step
+interface so any controller can drive it:
+
+    env = VectorEnv(256)
+    obs = env.reset(seed=0)
+    while not done.all():
+        obs, reward, done, info = env.step(policy(obs))
+
+Physics, collisions, the pipe difficulty schedule and the rewards are the
+ones used for training (see vector_sim.py with individual pipe rewards), so
+a NEAT network scores the same here as in ``evaluate_course``.
+Observations are the network inputs ``(y, |y - gap_y|, |x - pipe_x|)``,
+taken after gravity has moved the bird, as in training.  pygame is only
+imported when a game is rendered: by ``render()``, or after every
+``reset()`` and ``step()`` with ``render_mode="human"``.
+"""
+import math
+import random
+
+import numpy as np
+
+from course import Course
+from physics import (SCREEN_WIDTH, SCREEN_HEIGHT, GRAVITY, FLAP_STRENGTH, BIRD_SIZE,
+                     BIRD_X, BIRD_START_Y, WING_SPEED, PIPE_WIDTH)
+from vector_sim import PIPE_REWARD, SURVIVAL_REWARD
+
+# A pipe is only dealt once the previous one is passed, so at most two are
+# ever on screen; one spare slot keeps the arrays safe
+PIPE_SLOTS = 3
+RENDER_MODES = (None, "human")
+
+
+def screen_pipes(course, first, count, pipe_x):
+    """``(x, gap_y, gap_size)`` of the ``count`` pipes from ``first`` on, at ``pipe_x``."""
+    pipes = []
+    for slot in range(count):
+        gap_y, gap_size, _ = course.pipe(first + slot)
+        pipes.append((float(pipe_x[slot]), gap_y, gap_size))
+    return pipes
+
+
+class FrameRenderer:
+    """Draws one bird's frames in a window with the training game's renderer."""
+
+    def __init__(self):
+        # Only drawing needs pygame (and the drawing code of the AI game)
+        import flappy_bird_ai
+        self.pygame = flappy_bird_ai.pygame
+        self.game = flappy_bird_ai.Game(verbose=False)
+        self.bird = flappy_bird_ai.Bird(BIRD_X, BIRD_START_Y)
+
+    def draw(self, pipes, score, y, wing_angle, alive, label):
+        game = self.game
+        game.set_pipes(pipes)
+        game.score = int(score)
+        bird = self.bird
+        bird.y = float(y)
+        bird.wing_angle = float(wing_angle)
+        bird.alive = bool(alive)
+        game.draw([bird], label)
+
+    def close(self):
+        self.pygame.display.quit()
+
+
+class VectorEnv:
+    def __init__(self, num_envs, render_mode=None):
+        """``render_mode="human"`` draws game 0 after every reset and step."""
+        if render_mode not in RENDER_MODES:
+            raise ValueError(f"Unknown render mode {render_mode!r}, expected one of {RENDER_MODES}")
+        self.num_envs = num_envs
+        self.render_mode = render_mode
+        self.x = BIRD_X
+        self.courses = {}
+        self.seeds = None
+        self._viewer = None
+
+    def reset(self, seed=None):
+        """Start every game over and return the first observations.
+
+        ``seed`` is either an int (game i plays the course ``seed + i``), a
+        sequence with one course seed per game (repeat a seed to play the
+        same course in several games) or None for random courses.
+        """
+        n = self.num_envs
+        if seed is None:
+            seeds = [random.randrange(2**32) for _ in range(n)]
+        elif np.ndim(seed) == 0:
+            seeds = [int(seed) + i for i in range(n)]
+        else:
+            seeds = [int(s) for s in seed]
+            if len(seeds) != n:
+                raise ValueError(f"Expected {n} course seeds, got {len(seeds)}")
+        self.seeds = seeds
+        self._load_courses(seeds)
+
+        self.y = np.full(n, BIRD_START_Y, dtype=np.float64)
+        self.velocity = np.zeros(n, dtype=np.float64)
+        self.alive = np.ones(n, dtype=bool)
+        # Birds alive at the start of the current frame
+        self.started = np.ones(n, dtype=bool)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.frames = np.zeros(n, dtype=np.int64)
+        self.wing_angle = 0
+
+        # Pipes first .. first + count - 1 are on screen, oldest in slot 0
+        self.pipe_x = np.zeros((n, PIPE_SLOTS), dtype=np.float64)
+        self.pipe_x[:, 0] = SCREEN_WIDTH
+        self.first = np.zeros(n, dtype=np.int64)
+        self.count = np.ones(n, dtype=np.int64)
+
+        # Finished games keep their last observation
+        self.observations = np.zeros((n, 3), dtype=np.float64)
+        observations = self._begin_frame()
+        if self.render_mode == "human":
+            self.render()
+        return observations
+
+    def step(self, actions):
+        """Apply one flap decision per game and advance one frame.
+
+        ``actions`` holds a truthy value for every game whose bird should
+        flap.  Returns ``(observations, rewards, done, info)``; games that
+        are done stay frozen, earn nothing and ignore their action until
+        the next ``reset()``.  A bird that hits the ground is reported
+        done by the step after its last observation, which pays out the
+        survival reward for that frame as training does.
+        """
+        actions = np.asarray(actions).astype(bool)
+        rows = np.flatnonzero(self.started)
+        rewards = np.zeros(self.num_envs, dtype=np.float64)
+        rewards[rows] = SURVIVAL_REWARD
+        self.velocity[rows[actions[rows]]] = FLAP_STRENGTH
+
+        self._update_pipes(rows, rewards)
+        done = ~self.alive
+        observations = self._begin_frame()
+        info = {"score": self.score.copy(), "frames": self.frames.copy()}
+        if self.render_mode == "human":
+            self.render()
+        return observations, rewards, done, info
+
+    def _begin_frame(self):
+        """Move the live birds for the next frame and observe them."""
+        self.started = self.alive.copy()
+        rows = np.flatnonzero(self.started)
+        self.frames[rows] += 1
+
+        velocity = self.velocity[rows] + GRAVITY
+        y = self.y[rows] + velocity
+        top = y < 0
+        y[top] = 0
+        velocity[top] = 0
+        ground = y > SCREEN_HEIGHT - BIRD_SIZE
+        y[ground] = SCREEN_HEIGHT - BIRD_SIZE
+        velocity[ground] = 0
+        self.y[rows] = y
+        self.velocity[rows] = velocity
+        self.alive[rows[ground]] = False
+
+        self.wing_angle += WING_SPEED
+        if self.wing_angle > 2 * math.pi:
+            self.wing_angle = 0
+
+        # The next pipe is the second one once the first is behind the bird
+        slot = ((self.count[rows] > 1) & (self.pipe_x[rows, 0] < self.x)).astype(np.int64)
+        gap_y = self._lookup("gap_y", self.first[rows] + slot, rows)
+        observations = self.observations
+        observations[rows, 0] = y
+        observations[rows, 1] = np.abs(y - gap_y)
+        observations[rows, 2] = np.abs(self.x - self.pipe_x[rows, slot])
+        return observations.copy()
+
+    def _update_pipes(self, rows, rewards):
+        """Move, collide and score the pipes of the games in ``rows``."""
+        bird_top = np.zeros(self.num_envs, dtype=np.int64)
+        bird_top[rows] = self.y[rows]
+        passed = np.zeros(self.num_envs, dtype=bool)
+        for slot in range(PIPE_SLOTS):
+            active = rows[self.count[rows] > slot]
+            if not len(active):
+                break
+            index = self.first[active] + slot
+            self.pipe_x[active, slot] -= self._lookup("speed", index, active)
+            x = self.pipe_x[active, slot]
+
+            # Same integer geometry as pygame.Rect.colliderect in Pipe.collides_with
+            pipe_left = np.trunc(x).astype(np.int64)
+            gap_y = self._lookup("gap_y", index, active)
+            gap_size = self._lookup("gap_size", index, active)
+            top_height = gap_y - gap_size // 2
+            bottom_start = gap_y + gap_size // 2
+            top = bird_top[active]
+            overlap = (self.x - BIRD_SIZE < pipe_left + PIPE_WIDTH) & (self.x > pipe_left)
+            hit = overlap & (((top_height > 0) & (top < top_height)) | (top + BIRD_SIZE > bottom_start))
+            self.alive[active[hit]] = False
+
+            # Pipes are passed in order, so the unpassed one has index == score
+            scoring = (index == self.score[active]) & (x < self.x) & self.alive[active]
+            passed[active[scoring]] = True
+
+        rewards[passed] += PIPE_REWARD
+
+        # Only the oldest pipe can have left the screen
+        gone = rows[self.pipe_x[rows, 0] + PIPE_WIDTH < 0]
+        self.pipe_x[gone, :-1] = self.pipe_x[gone, 1:]
+        self.first[gone] += 1
+        self.count[gone] -= 1
+
+        # Passing a pipe deals the next one at the right edge
+        dealt = np.flatnonzero(passed)
+        self.score[dealt] += 1
+        self.pipe_x[dealt, self.count[dealt]] = SCREEN_WIDTH
+        self.count[dealt] += 1
+
+    def _load_courses(self, seeds):
+        for seed in set(seeds):
+            if seed not in self.courses:
+                self.courses[seed] = Course(seed)
+        self._course_seeds = sorted(set(seeds))
+        row_of = {seed: i for i, seed in enumerate(self._course_seeds)}
+        self._course_rows = np.array([row_of[seed] for seed in seeds], dtype=np.intp)
+        self._stack_tables(0)
+
+    def _stack_tables(self, length):
+        courses = [self.courses[seed] for seed in self._course_seeds]
+        length = max([length] + [len(course) for course in courses])
+        for course in courses:
+            course.extend(length)
+        self._tables = {
+            name: np.stack([np.asarray(course.table[name][:length], dtype=dtype) for course in courses])
+            for name, dtype in (("gap_y", np.int64), ("gap_size", np.int64), ("speed", np.float64))
+        }
+
+    def _lookup(self, name, index, rows=None):
+        """Course value ``name`` of pipe ``index`` for each game in ``rows``."""
+        table = self._tables[name]
+        if len(index) and index.max() >= table.shape[1]:
+            self._stack_tables(int(index.max()) + 1)
+            table = self._tables[name]
+        course_rows = self._course_rows if rows is None else self._course_rows[rows]
+        return table[course_rows, index]
+
+    def render(self, index=0):
+        """Draw game ``index`` in a pygame window."""
+        if self._viewer is None:
+            self._viewer = FrameRenderer()
+        self._viewer.pygame.event.pump()
+        pipes = screen_pipes(self.courses[self.seeds[index]], int(self.first[index]),
+                             int(self.count[index]), self.pipe_x[index])
+        self._viewer.draw(pipes, self.score[index], self.y[index], self.wing_angle,
+                          self.alive[index], f"env {index}")
+
+    def close(self):
+        if self._viewer is not None:
+            self._viewer.close()
+            self._viewer = None
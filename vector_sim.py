@@ -0,0 +1,244 @@
+"""Struct-of-arrays population simulator for NEAT training.
+
+Runs the same physics, collision and fitness rules as the per-object
+Bird/Pipe loop in flappy_bird_ai.py, but keeps every bird's state in
+NumPy arrays so a whole population advances with a handful of array
+operations per frame.
+"""
+import math
+import time
+
+import numpy as np
+
+from physics import (SCREEN_HEIGHT, GRAVITY, FLAP_STRENGTH, BIRD_SIZE, BIRD_X,
+                     BIRD_START_Y, WING_SPEED)
+from instrumentation import NULL_PROBE
+
+PIPE_REWARD = 5
+SURVIVAL_REWARD = 0.1
+
+
+class PopulationSim:
+    def __init__(self, size, game, shared_pipe_reward=True, probe=NULL_PROBE, recorder=None,
+                 decision_interval=1):
+        self.game = game
+        # Receives per-phase timings and frame counters
+        self.probe = probe
+        # Optional ``record(rows, flapping)`` sink for the flap decisions (see replay.py)
+        self.recorder = recorder
+        # Shared: every genome earns each pipe bonus, dead or alive (original rules).
+        # Otherwise only birds alive when the pipe is passed earn it.
+        self.shared_pipe_reward = shared_pipe_reward
+        self.x = BIRD_X
+        self.y = np.full(size, BIRD_START_Y, dtype=np.float64)
+        self.velocity = np.zeros(size, dtype=np.float64)
+        self.alive = np.ones(size, dtype=bool)
+        # Genome fitness (survival + pipe rewards)
+        self.fitness = np.zeros(size, dtype=np.float64)
+        # Per-bird shaping reward, mirrors Game.update_fitness / Bird.fitness
+        self.shaping = np.zeros(size, dtype=np.float64)
+        # All live birds flap in lockstep, so one wing phase covers them all
+        self.wing_angle = 0
+        # Networks are queried every k-th frame; in between each bird repeats its last decision
+        self.decision_interval = decision_interval
+        self.decisions = np.zeros(size, dtype=bool)
+
+    def any_alive(self):
+        return bool(self.alive.any())
+
+    def num_alive(self):
+        return int(np.count_nonzero(self.alive))
+
+    def step(self, activate):
+        """Advance one frame.
+
+        ``activate(inputs, rows)`` receives the network inputs of the live
+        birds as an (n, 3) array plus their population indices and returns
+        one output per row; a bird flaps when its output is above 0.5.
+        With a decision interval of k it is only called on frames 1, k + 1,
+        2k + 1, ... and the birds repeat their decisions on the frames between.
+        """
+        game = self.game
+        probe = self.probe
+        t = probe.clock()
+        game.frame_iteration += 1
+
+        # Pick the pipe the networks look at
+        pipes = game.pipes
+        pipe = pipes[1] if len(pipes) > 1 and pipes[0].x < self.x else pipes[0]
+
+        rows = np.flatnonzero(self.alive)
+        self._update_birds(rows)
+        self.fitness[rows] += SURVIVAL_REWARD
+        t = probe.lap("physics", t)
+
+        decide = (game.frame_iteration - 1) % self.decision_interval == 0
+        if decide:
+            # Neural network inputs
+            y = self.y[rows]
+            inputs = np.empty((len(rows), 3), dtype=np.float64)
+            inputs[:, 0] = y
+            inputs[:, 1] = np.abs(y - pipe.gap_y)
+            inputs[:, 2] = abs(self.x - pipe.x)
+            output = np.asarray(activate(inputs, rows), dtype=np.float64)
+            flapping = rows[output > 0.5]
+            if self.decision_interval > 1:
+                self.decisions[rows] = output > 0.5
+        else:
+            flapping = rows[self.decisions[rows]]
+        self.velocity[flapping] = FLAP_STRENGTH
+        if self.recorder is not None:
+            self.recorder.record(rows, flapping)
+        t = probe.lap("inference", t)
+
+        # Pipe movement, collisions and scoring
+        self._update_pipes()
+        t = probe.lap("collisions", t)
+        self._update_shaping()
+        probe.lap("shaping", t)
+
+        probe.count("frames")
+        if decide:
+            probe.count("activations", len(rows))
+        probe.count("alive_bird_frames", len(rows))
+
+    def _update_birds(self, rows):
+        velocity = self.velocity[rows] + GRAVITY
+        y = self.y[rows] + velocity
+
+        # Keep birds within screen bounds; touching the ground is fatal
+        top = y < 0
+        y[top] = 0
+        velocity[top] = 0
+        ground = y > SCREEN_HEIGHT - BIRD_SIZE
+        y[ground] = SCREEN_HEIGHT - BIRD_SIZE
+        velocity[ground] = 0
+
+        self.y[rows] = y
+        self.velocity[rows] = velocity
+        self.alive[rows[ground]] = False
+
+        self.wing_angle += WING_SPEED
+        if self.wing_angle > 2 * math.pi:
+            self.wing_angle = 0
+
+    def _update_pipes(self):
+        game = self.game
+        rem = []
+        add_pipe = False
+        for pipe in game.pipes:
+            pipe.update()
+            self._collide(pipe)
+
+            if not pipe.passed and pipe.x < self.x and self.alive.any():
+                pipe.passed = True
+                add_pipe = True
+                if not self.shared_pipe_reward:
+                    self.fitness[self.alive] += PIPE_REWARD
+
+            if pipe.x + pipe.width < 0:
+                rem.append(pipe)
+
+        if add_pipe:
+            game.score_pipe()
+            if self.shared_pipe_reward:
+                self.fitness += PIPE_REWARD
+
+        for pipe in rem:
+            game.pipes.remove(pipe)
+
+    def _collide(self, pipe):
+        # Same integer geometry as pygame.Rect.colliderect in Pipe.collides_with
+        pipe_x = int(pipe.x)
+        bird_left = self.x - BIRD_SIZE
+        if not (bird_left < pipe_x + pipe.width and self.x > pipe_x):
+            return
+        rows = np.flatnonzero(self.alive)
+        bird_top = self.y[rows].astype(np.int64)
+        top_height = pipe.gap_y - pipe.gap_size // 2
+        bottom_start = pipe.gap_y + pipe.gap_size // 2
+        hit = bird_top + BIRD_SIZE > bottom_start
+        if top_height > 0:
+            hit |= bird_top < top_height
+        self.alive[rows[hit]] = False
+
+    def _update_shaping(self):
+        rows = np.flatnonzero(self.alive)
+        self.shaping[rows] += SURVIVAL_REWARD
+        pipes = self.game.pipes
+        if pipes:
+            pipe = pipes[0]
+            if pipe.x < self.x and not pipe.passed:
+                vertical_distance = np.abs(self.y[rows] - pipe.gap_y)
+                self.shaping[rows] += (100 - vertical_distance) / 100
+
+    def sync_birds(self, birds):
+        """Copy the array state onto Bird objects so they can be drawn."""
+        for bird, y, alive in zip(birds, self.y.tolist(), self.alive.tolist()):
+            bird.y = y
+            bird.alive = alive
+            bird.wing_angle = self.wing_angle
+
+
+class GenerationBudget:
+    """Per-generation frame and wall-clock limits with early stopping.
+
+    ``max_frames`` also sets the reference horizon for normalization: when a
+    run is cut short by the clock, the surviving birds' fitness is projected
+    onto ``max_frames`` frames so generations that were truncated at
+    different points stay comparable.  Birds that already died keep their
+    fitness, and so does a lone leader left by the ranking rule: its lead is
+    all that matters, and projecting it would only inflate the score.
+    A projection never reaches ``projection_ceiling`` (NEAT's fitness
+    threshold), so a guess alone can not end training.  A clock limit
+    therefore needs ``max_frames`` as its horizon.
+    """
+
+    def __init__(self, max_frames=None, max_seconds=None, fitness_threshold=None,
+                 stop_when_ranked=False, projection_ceiling=None):
+        if max_seconds is not None and max_frames is None:
+            raise ValueError("max_seconds needs max_frames as the horizon for normalization")
+        self.max_frames = max_frames
+        self.max_seconds = max_seconds
+        self.fitness_threshold = fitness_threshold
+        self.stop_when_ranked = stop_when_ranked
+        self.projection_ceiling = projection_ceiling
+        self.reason = None
+        self.started = None
+
+    def start(self):
+        self.reason = None
+        self.started = time.perf_counter()
+
+    def exhausted(self, sim):
+        """Return True (and record why) once the generation should stop."""
+        frames = sim.game.frame_iteration
+        if self.max_frames is not None and frames >= self.max_frames:
+            self.reason = "frames"
+        elif self.max_seconds is not None and time.perf_counter() - self.started >= self.max_seconds:
+            self.reason = "time"
+        elif self.fitness_threshold is not None and sim.fitness.max() >= self.fitness_threshold:
+            self.reason = "threshold"
+        elif self.stop_when_ranked and self._ranking_settled(sim):
+            self.reason = "ranking"
+        return self.reason is not None
+
+    @staticmethod
+    def _ranking_settled(sim):
+        # Live birds earn identical rewards, so only a lone survivor that
+        # already leads can no longer change the order
+        if sim.num_alive() != 1:
+            return False
+        return sim.fitness[sim.alive].max() >= sim.fitness.max()
+
+    def normalize(self, sim):
+        """Project the survivors of a truncated run onto the frame horizon."""
+        frames = sim.game.frame_iteration
+        if self.reason != "time" or self.max_frames is None or frames == 0:
+            return
+        fitness = sim.fitness[sim.alive]
+        projected = fitness * (self.max_frames / frames)
+        if self.projection_ceiling is not None:
+            # Stay just below the threshold; a score that got there by itself is kept
+            projected = np.maximum(fitness, np.minimum(projected, np.nextafter(self.projection_ceiling, -np.inf)))
+        sim.fitness[sim.alive] = projected